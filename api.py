@@ -0,0 +1,479 @@
+"""LMW Farm storefront API
+
+Backend for the React site (lmw-farm-website/src/services/api.js), serving
+the star schema from "LMW FARM STAR SCHEMA DATABASE DESIGN.pgsql".
+
+Run with:
+    DATABASE_URL=postgresql://localhost/lmw_farm uvicorn api:app --port 8000 --workers 4
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
+
+import asyncpg
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+
+from orders import generate_order_number
+from warehouse import DIM_TIME_HORIZON_DAYS, TimeIdCache
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "postgresql://localhost/lmw_farm")
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "20"))
+CATALOG_VERSION_CHECK_INTERVAL = float(os.environ.get("CATALOG_VERSION_CHECK_INTERVAL", "5"))
+DIM_TIME_HORIZON_DAYS = int(os.environ.get("DIM_TIME_HORIZON_DAYS", DIM_TIME_HORIZON_DAYS))
+CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173").split(",")
+ASSET_DIR = os.environ.get("ASSET_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "assets"))
+
+PRODUCT_COLUMNS = """
+    product_id, product_name, category, subcategory, breed, product_type,
+    size, description, unit_price, is_active
+"""
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # One pool per worker process; asyncpg also caches prepared statements per connection
+    app.state.pool = await asyncpg.create_pool(
+        DATABASE_URL, min_size=DB_POOL_MIN_SIZE, max_size=DB_POOL_MAX_SIZE
+    )
+    app.state.time_ids = await load_time_ids(app.state.pool)
+    try:
+        yield
+    finally:
+        await app.state.pool.close()
+
+
+app = FastAPI(title="LMW Farm API", lifespan=lifespan)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+
+def get_pool(request: Request) -> asyncpg.Pool:
+    return request.app.state.pool
+
+
+async def load_time_ids(pool):
+    """Extend dim_time past the horizon if needed and snapshot it for stamping orders"""
+    await pool.fetchval("SELECT extend_dim_time($1)", DIM_TIME_HORIZON_DAYS)
+    return TimeIdCache(tuple(row) for row in await pool.fetch("SELECT date, time_id FROM dim_time"))
+
+
+async def get_time_id(request: Request, day):
+    time_id = request.app.state.time_ids.get(day)
+    if time_id is None:
+        # Only after running past the horizon loaded at startup
+        request.app.state.time_ids = await load_time_ids(get_pool(request))
+        time_id = request.app.state.time_ids.get(day)
+    return time_id
+
+
+# ============================================
+# REQUEST MODELS
+# ============================================
+
+class CartItemIn(BaseModel):
+    session_id: str
+    product_id: int
+    quantity: int = Field(1, gt=0)
+    customer_id: Optional[int] = None
+
+
+class CustomerIn(BaseModel):
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    phone: Optional[str] = None
+
+
+class OrderItemIn(BaseModel):
+    product_id: int
+    quantity: int = Field(gt=0)
+
+
+class OrderIn(BaseModel):
+    customer_id: int
+    location_id: int
+    items: List[OrderItemIn] = Field(min_length=1)
+    session_id: Optional[str] = None  # clears this cart once the order is placed
+
+
+# ============================================
+# PRODUCTS
+# ============================================
+
+class CatalogCache:
+    """Pre-serialized catalog JSON, whole and per category, keyed to the dim_products version
+
+    The version is (MAX(updated_at), COUNT(*)), checked at most once per
+    check_interval seconds, so repeat catalog requests normally skip the
+    database entirely and conditional requests cost a string compare.
+
+    Each version is built once, from a single query, into a body for the whole
+    catalog and one per category present in it. Any other category name gets a
+    shared empty body and is never cached, so clients can't grow the cache.
+    Requests arriving during a rebuild await the same build instead of queueing
+    behind a lock.
+    """
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._version = None
+        self._checked_at = 0.0
+        self._bodies = {}  # category (None = all) -> (etag, body), for _bodies_version
+        self._bodies_version = None
+        self._build = None  # (version, task) of the latest build
+
+    async def _current_version(self, pool):
+        now = time.monotonic()
+        if self._version is None or now - self._checked_at >= self.check_interval:
+            row = await pool.fetchrow("SELECT MAX(updated_at) AS updated_at, COUNT(*) AS products FROM dim_products")
+            self._version = (row["updated_at"], row["products"])
+            self._checked_at = now
+        return self._version
+
+    async def get(self, pool, category=None):
+        """Return (etag, body) for one category, or the whole active catalog"""
+        bodies = await self._current_bodies(pool)
+        return bodies.get(category, EMPTY_CATALOG)
+
+    async def _current_bodies(self, pool):
+        version = await self._current_version(pool)
+        if self._bodies_version == version:
+            return self._bodies
+        build_version, task = self._build or (None, None)
+        if task is None or build_version != version or (task.done() and (task.cancelled() or task.exception())):
+            task = asyncio.ensure_future(self._build_bodies(pool, version))
+            self._build = (version, task)
+        # Shielded so one client disconnecting doesn't cancel the build for everyone waiting on it
+        bodies = await asyncio.shield(task)
+        if self._build[1] is task:
+            self._bodies, self._bodies_version = bodies, version
+        return bodies
+
+    async def _build_bodies(self, pool, version):
+        rows = [dict(row) for row in await pool.fetch(f"""
+            SELECT {PRODUCT_COLUMNS} FROM dim_products
+            WHERE is_active = TRUE
+            ORDER BY category, subcategory, product_name
+        """)]
+        by_category = {}
+        for row in rows:
+            if row["category"] is not None:
+                by_category.setdefault(row["category"], []).append(row)
+
+        updated_at, products = version
+        stamp = updated_at.isoformat() if updated_at else "empty"
+
+        def entry(category, category_rows):
+            body = json.dumps(jsonable_encoder(category_rows), separators=(",", ":")).encode()
+            tag = hashlib.sha256(f"{stamp}|{products}|{category}".encode()).hexdigest()[:32]
+            return f'"{tag}"', body
+
+        bodies = {None: entry(None, rows)}
+        bodies.update((category, entry(category, category_rows)) for category, category_rows in by_category.items())
+        return bodies
+
+
+# Body for categories with no active products; the same for every name and version
+EMPTY_CATALOG = ('"empty-catalog"', b"[]")
+
+catalog_cache = CatalogCache(check_interval=CATALOG_VERSION_CHECK_INTERVAL)
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def catalog_response(request, category=None):
+    etag, body = await catalog_cache.get(get_pool(request), category)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # always revalidate, usually with a 304
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/products/")
+async def list_products(request: Request):
+    return await catalog_response(request)
+
+
+@app.get("/products/category/{category}")
+async def list_products_by_category(category: str, request: Request):
+    return await catalog_response(request, category)
+
+
+@app.get("/products/{product_id}")
+async def get_product(product_id: int, request: Request):
+    row = await get_pool(request).fetchrow(
+        f"SELECT {PRODUCT_COLUMNS} FROM dim_products WHERE product_id = $1", product_id
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return dict(row)
+
+
+# ============================================
+# CART
+# ============================================
+
+CART_ITEM_QUERY = """
+    SELECT c.cart_id, c.session_id, c.customer_id, c.product_id, dp.product_name,
+           dp.unit_price, c.quantity, dp.unit_price * c.quantity AS line_total
+    FROM cart c
+    JOIN dim_products dp ON dp.product_id = c.product_id
+"""
+
+
+@app.post("/cart/add")
+async def add_to_cart(item: CartItemIn, request: Request):
+    async with get_pool(request).acquire() as conn:
+        async with conn.transaction():
+            # Adding a product already in the cart bumps its quantity instead of duplicating the line
+            cart_id = await conn.fetchval("""
+                UPDATE cart SET quantity = quantity + $3, updated_at = CURRENT_TIMESTAMP
+                WHERE session_id = $1 AND product_id = $2
+                RETURNING cart_id
+            """, item.session_id, item.product_id, item.quantity)
+            if cart_id is None:
+                try:
+                    cart_id = await conn.fetchval("""
+                        INSERT INTO cart (customer_id, session_id, product_id, quantity)
+                        VALUES ($1, $2, $3, $4)
+                        RETURNING cart_id
+                    """, item.customer_id, item.session_id, item.product_id, item.quantity)
+                except asyncpg.ForeignKeyViolationError:
+                    raise HTTPException(status_code=404, detail="Product not found")
+        row = await conn.fetchrow(CART_ITEM_QUERY + " WHERE c.cart_id = $1", cart_id)
+    return dict(row)
+
+
+@app.get("/cart/{session_id}")
+async def get_cart(session_id: str, request: Request):
+    rows = await get_pool(request).fetch(
+        CART_ITEM_QUERY + " WHERE c.session_id = $1 ORDER BY c.added_at", session_id
+    )
+    return [dict(row) for row in rows]
+
+
+@app.delete("/cart/{cart_id}")
+async def remove_from_cart(cart_id: int, request: Request):
+    deleted = await get_pool(request).fetchval(
+        "DELETE FROM cart WHERE cart_id = $1 RETURNING cart_id", cart_id
+    )
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Cart item not found")
+    return {"cart_id": deleted, "removed": True}
+
+
+@app.put("/cart/{cart_id}/quantity")
+async def update_cart_quantity(cart_id: int, quantity: int, request: Request):
+    if quantity <= 0:
+        return await remove_from_cart(cart_id, request)
+    async with get_pool(request).acquire() as conn:
+        updated = await conn.fetchval("""
+            UPDATE cart SET quantity = $2, updated_at = CURRENT_TIMESTAMP
+            WHERE cart_id = $1
+            RETURNING cart_id
+        """, cart_id, quantity)
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Cart item not found")
+        row = await conn.fetchrow(CART_ITEM_QUERY + " WHERE c.cart_id = $1", cart_id)
+    return dict(row)
+
+
+# ============================================
+# CUSTOMERS
+# ============================================
+
+@app.post("/customers/")
+async def create_customer(customer: CustomerIn, request: Request):
+    # Returning customers check out with the same email, so this upserts
+    row = await get_pool(request).fetchrow("""
+        INSERT INTO dim_customers (email, first_name, last_name, phone, registration_date)
+        VALUES (lower($1), $2, $3, $4, CURRENT_DATE)
+        ON CONFLICT (email) DO UPDATE
+        SET first_name = COALESCE(EXCLUDED.first_name, dim_customers.first_name),
+            last_name = COALESCE(EXCLUDED.last_name, dim_customers.last_name),
+            phone = COALESCE(EXCLUDED.phone, dim_customers.phone)
+        RETURNING customer_id, email, first_name, last_name, phone, customer_type
+    """, customer.email.strip(), customer.first_name, customer.last_name, customer.phone)
+    return dict(row)
+
+
+# ============================================
+# ORDERS
+# ============================================
+
+ORDER_LINES_QUERY = """
+    SELECT fo.order_number, fo.customer_id, fo.location_id, fo.order_status, fo.created_at,
+           fo.product_id, dp.product_name, fo.quantity, fo.unit_price, fo.line_total
+    FROM fact_orders fo
+    JOIN dim_products dp ON dp.product_id = fo.product_id
+"""
+
+
+def summarize_order(lines):
+    """Group fact_orders line rows for one order number into an order document"""
+    first = lines[0]
+    return {
+        "order_number": first["order_number"],
+        "customer_id": first["customer_id"],
+        "location_id": first["location_id"],
+        "order_status": first["order_status"],
+        "created_at": first["created_at"],
+        "order_total": sum(line["line_total"] for line in lines),
+        "items": [
+            {key: line[key] for key in ("product_id", "product_name", "quantity", "unit_price", "line_total")}
+            for line in lines
+        ],
+    }
+
+
+async def reserve_inventory(conn, product_id, quantity):
+    """Reserve tracked stock for one product; False if the product is tracked and short"""
+    # FOR UPDATE makes a concurrent order wait for the row and re-check the stock
+    # (moving on to the next row if it no longer has enough), and the outer
+    # condition re-checks it again under the lock, so two orders can't both
+    # reserve the last units
+    reserved = await conn.fetchval("""
+        UPDATE inventory
+        SET quantity_reserved = COALESCE(quantity_reserved, 0) + $2, last_updated = CURRENT_TIMESTAMP
+        WHERE inventory_id = (
+            SELECT inventory_id FROM inventory
+            WHERE product_id = $1 AND quantity_available - COALESCE(quantity_reserved, 0) >= $2
+            ORDER BY inventory_id
+            LIMIT 1
+            FOR UPDATE
+        )
+          AND quantity_available - COALESCE(quantity_reserved, 0) >= $2
+        RETURNING inventory_id
+    """, product_id, quantity)
+    if reserved is not None:
+        return True
+    # Products without an inventory row (merch, made-to-order) aren't stock limited
+    return not await conn.fetchval("SELECT EXISTS (SELECT 1 FROM inventory WHERE product_id = $1)", product_id)
+
+
+@app.post("/orders/", status_code=201)
+async def create_order(order: OrderIn, request: Request):
+    quantities = {}
+    for item in order.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    product_ids = sorted(quantities)  # fixed lock order keeps concurrent orders deadlock-free
+    # Stamp created_at here rather than with the database clock so time_id is always its date
+    created_at = datetime.now()
+    time_id = await get_time_id(request, created_at.date())
+    if time_id is None:
+        raise HTTPException(status_code=503, detail="Calendar dimension is missing today's date")
+
+    async with get_pool(request).acquire() as conn:
+        async with conn.transaction():
+            prices = dict(await conn.fetch("""
+                SELECT product_id, unit_price FROM dim_products
+                WHERE product_id = ANY($1::int[]) AND is_active = TRUE
+            """, product_ids))
+            missing = [product_id for product_id in product_ids if product_id not in prices]
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Products not available: {missing}")
+
+            for product_id in product_ids:
+                if not await reserve_inventory(conn, product_id, quantities[product_id]):
+                    raise HTTPException(status_code=409, detail=f"Product {product_id} just sold out")
+
+            order_number = generate_order_number()
+            try:
+                await conn.execute("""
+                    INSERT INTO fact_orders
+                    (product_id, customer_id, time_id, location_id, order_number,
+                     quantity, unit_price, line_total, order_status, created_at)
+                    SELECT item.product_id, $1, $2, $3, $4, item.quantity, item.unit_price,
+                           item.quantity * item.unit_price, 'pending', $8
+                    FROM unnest($5::int[], $6::int[], $7::numeric[]) AS item(product_id, quantity, unit_price)
+                """, order.customer_id, time_id, order.location_id, order_number,
+                    product_ids, [quantities[p] for p in product_ids], [prices[p] for p in product_ids], created_at)
+            except asyncpg.ForeignKeyViolationError:
+                raise HTTPException(status_code=400, detail="Unknown customer or location")
+
+            order_total = sum(prices[p] * quantities[p] for p in product_ids)
+            await conn.execute("""
+                UPDATE dim_customers
+                SET last_purchase_date = CURRENT_DATE,
+                    total_lifetime_orders = COALESCE(total_lifetime_orders, 0) + 1,
+                    total_lifetime_value = COALESCE(total_lifetime_value, 0) + $2
+                WHERE customer_id = $1
+            """, order.customer_id, order_total)
+
+            if order.session_id:
+                await conn.execute("DELETE FROM cart WHERE session_id = $1", order.session_id)
+
+            lines = await conn.fetch(ORDER_LINES_QUERY + " WHERE fo.order_number = $1 ORDER BY fo.order_fact_id", order_number)
+    return summarize_order(lines)
+
+
+@app.get("/orders/{order_number}")
+async def get_order(order_number: str, request: Request):
+    lines = await get_pool(request).fetch(
+        ORDER_LINES_QUERY + " WHERE fo.order_number = $1 ORDER BY fo.order_fact_id", order_number
+    )
+    if not lines:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return summarize_order(lines)
+
+
+@app.get("/orders/customer/{customer_id}")
+async def get_customer_orders(customer_id: int, request: Request):
+    lines = await get_pool(request).fetch(
+        ORDER_LINES_QUERY + " WHERE fo.customer_id = $1 ORDER BY fo.created_at DESC, fo.order_fact_id",
+        customer_id
+    )
+    orders = {}
+    for line in lines:
+        orders.setdefault(line["order_number"], []).append(line)
+    return [summarize_order(order_lines) for order_lines in orders.values()]
+
+
+# ============================================
+# ASSETS
+# ============================================
+
+# Store files are named <content hash>-<size>.<ext> by build_assets.py, so a
+# URL's content never changes and browsers and proxies can keep it for a year
+ASSET_FILE_PATTERN = re.compile(r"[0-9a-f]{16}-[0-9a-z]+\.(?:webp|jpg|png)")
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@app.get("/assets/manifest.json")
+async def get_asset_manifest():
+    path = os.path.join(ASSET_DIR, "manifest.json")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Assets have not been built")
+    return FileResponse(path, media_type="application/json", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/assets/{file_name}")
+async def get_asset(file_name: str, request: Request):
+    path = os.path.join(ASSET_DIR, file_name)
+    if not ASSET_FILE_PATTERN.fullmatch(file_name) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Asset not found")
+    headers = {"ETag": f'"{file_name}"', "Cache-Control": ASSET_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
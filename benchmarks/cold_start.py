@@ -0,0 +1,175 @@
+"""Cold-start benchmark for the Streamlit app
+
+Every measurement runs in a fresh interpreter, so imports are paid for again
+just as they are when the Streamlit server starts. Reports the time to import
+main.py (its module-level code, without rendering) and the first render of
+each page, plus which heavy libraries each one loaded. Exits non-zero when a
+page in LIGHT_PAGES loads one of them, a page raises, or a budget is exceeded,
+so it can run in CI.
+
+A page's time is its first run in a new session after the home page has
+rendered once (the sidebar selectbox is the only way to reach it), so it
+includes that page's own lazy imports but not the app's shared start-up.
+
+Usage:
+    python benchmarks/cold_start.py --repeat 5
+    python benchmarks/cold_start.py --dsn postgresql://localhost/lmw_farm \\
+        --import-budget-ms 1500 --page-budget-ms 3000 --json cold_start.json
+"""
+import argparse
+import json
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+MAIN_SCRIPT = REPO_ROOT / "main.py"
+
+HOME_PAGE = "🏠 Home & Our Story"
+PAGES = [
+    HOME_PAGE,
+    "🥚 Order Fresh Eggs",
+    "📦 Subscription Service",
+    "🐔 Our Chickens & Breeds",
+    "📍 Pickup Locations",
+    "📞 Contact Us",
+    "🔐 Admin Panel",
+]
+# Pages that must render without loading any of HEAVY_MODULES
+LIGHT_PAGES = [HOME_PAGE, "📦 Subscription Service", "📞 Contact Us"]
+# plotly.graph_objects and PIL aren't listed: Streamlit itself imports them
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "plotly.express"]
+
+
+def heavy_modules_loaded():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def measure_import():
+    """Import Streamlit, then run main.py's module-level code without rendering a page"""
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    streamlit_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    runpy.run_path(str(MAIN_SCRIPT), run_name="cold_start")
+    return {
+        "streamlit_ms": streamlit_ms,
+        "ms": (time.perf_counter() - start) * 1000,
+        "heavy_modules": heavy_modules_loaded(),
+        "exceptions": [],
+    }
+
+
+def measure_page(page, secrets):
+    """First render of one page in a new AppTest session"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(MAIN_SCRIPT), default_timeout=120)
+    if secrets:
+        app.secrets.update(secrets)
+    start = time.perf_counter()
+    app.run()
+    elapsed = time.perf_counter() - start
+    if page != HOME_PAGE:
+        start = time.perf_counter()
+        app.sidebar.selectbox[0].select(page).run()
+        elapsed = time.perf_counter() - start
+    return {
+        "ms": elapsed * 1000,
+        "heavy_modules": heavy_modules_loaded(),
+        "exceptions": [str(exception.value) for exception in app.exception],
+    }
+
+
+def run_worker(step, dsn):
+    """Run one measurement in a fresh interpreter and return its result"""
+    command = [sys.executable, __file__, "--worker", step]
+    if dsn:
+        command += ["--dsn", dsn]
+    completed = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True, env=os.environ.copy())
+    if completed.returncode != 0:
+        raise RuntimeError(f"{step} worker failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(steps, repeat, dsn):
+    """Median and min time per step over repeat cold starts"""
+    results = {}
+    for step in steps:
+        runs = [run_worker(step, dsn) for _ in range(repeat)]
+        results[step] = {
+            "median_ms": statistics.median(run["ms"] for run in runs),
+            "min_ms": min(run["ms"] for run in runs),
+            "heavy_modules": sorted({name for run in runs for name in run["heavy_modules"]}),
+            "exceptions": sorted({message for run in runs for message in run["exceptions"]}),
+        }
+        if "streamlit_ms" in runs[0]:
+            results[step]["streamlit_median_ms"] = statistics.median(run["streamlit_ms"] for run in runs)
+    return results
+
+
+def check_budgets(results, import_budget_ms, page_budget_ms):
+    """Every regression found, as human-readable messages"""
+    failures = []
+    for step, result in results.items():
+        if result["exceptions"]:
+            failures.append(f"{step} raised: {'; '.join(result['exceptions'])}")
+        if step in LIGHT_PAGES and result["heavy_modules"]:
+            failures.append(f"{step} loaded {', '.join(result['heavy_modules'])}")
+        budget = import_budget_ms if step == "import" else page_budget_ms
+        if budget is not None and result["median_ms"] > budget:
+            failures.append(f"{step} took {result['median_ms']:.0f} ms (budget {budget:.0f} ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure main.py import and per-page first-render time")
+    parser.add_argument("--repeat", type=int, default=3, help="cold starts per step")
+    parser.add_argument("--pages", nargs="*", default=PAGES, help="pages to render (default: all)")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"),
+                        help="database for the pages to read from; without one they render their fallbacks")
+    parser.add_argument("--import-budget-ms", type=float, help="fail if importing main.py takes longer")
+    parser.add_argument("--page-budget-ms", type=float, help="fail if any page's first render takes longer")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        if args.worker == "import":
+            result = measure_import()
+        else:
+            secrets = None
+            if args.dsn:
+                from psycopg2.extensions import parse_dsn
+                secrets = {"postgres": parse_dsn(args.dsn)}
+            result = measure_page(args.worker, secrets)
+        print(json.dumps(result))
+        return
+
+    results = run_benchmark(["import"] + args.pages, args.repeat, args.dsn)
+
+    print(f"{'step':<28}{'median ms':>11}{'min ms':>9}  heavy modules")
+    for step, result in results.items():
+        label = step if step != "import" else "import main.py"
+        print(f"{label:<28}{result['median_ms']:>11.0f}{result['min_ms']:>9.0f}  "
+              f"{', '.join(result['heavy_modules']) or '-'}")
+    print(f"(importing streamlit itself: {results['import']['streamlit_median_ms']:.0f} ms median)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    failures = check_budgets(results, args.import_budget_ms, args.page_budget_ms)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
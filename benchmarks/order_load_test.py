@@ -0,0 +1,225 @@
+"""Concurrency load test for the storefront order path
+
+Seeds an isolated schema in a local Postgres from the repo's SQL files, then
+runs N simulated customers placing egg, chick and mixed orders through
+orders.place_order (the same path main.py's order forms use). Reports
+throughput, latency percentiles and checks that stock was never oversold.
+
+Usage:
+    python benchmarks/order_load_test.py --dsn postgresql://localhost/lmw_farm \\
+        --customers 50 --orders-per-customer 20 --pool-size 10
+"""
+import argparse
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import psycopg2
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from orders import OrderLine, place_order  # noqa: E402
+
+SQL_DIR = REPO_ROOT / "lmw-farm-website"
+SEED_FILES = [
+    "-- LMW FARM STAR SCHEMA DATABASE DESIGN.pgsql",
+    "-- LMW FARM - COMPLETE PRODUCT LIST.pgsql",
+    "-- LMW FARM - STOREFRONT ORDER TABLES.pgsql",
+]
+BENCH_SCHEMA = "lmw_bench"
+EGG_SKU = "EGG-DOZ-001"
+
+
+def connect(dsn):
+    """Open a connection with the benchmark schema first on the search path"""
+    return psycopg2.connect(dsn, options=f"-c search_path={BENCH_SCHEMA}")
+
+
+def seed_database(dsn, egg_stock, chick_stock):
+    """Recreate the benchmark schema and stock eggs plus every chick product from the product list"""
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+            cur.execute(f"SET search_path TO {BENCH_SCHEMA}")
+            for filename in SEED_FILES:
+                cur.execute((SQL_DIR / filename).read_text())
+
+            # The storefront sells from `products`; derive it from the catalog in dim_products
+            cur.execute("""
+                INSERT INTO products (name, description, sku, category_id, current_stock, price)
+                SELECT DISTINCT ON (product_name)
+                       product_name, description, 'EGG-DOZ-001', 1, %s, unit_price
+                FROM dim_products
+                WHERE product_name = 'Rainbow Dozen Eggs'
+                ORDER BY product_name, product_id
+            """, (egg_stock,))
+            cur.execute("""
+                INSERT INTO products (name, description, sku, category_id, current_stock, price)
+                SELECT DISTINCT ON (product_name)
+                       product_name, description, 'CHK-' || product_id, 2, %s, unit_price
+                FROM dim_products
+                WHERE subcategory = 'chicks'
+                ORDER BY product_name, product_id
+            """, (chick_stock,))
+            cur.execute("SELECT sku, current_stock, price FROM products ORDER BY sku")
+            return {sku: (stock, price) for sku, stock, price in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+class ConnectionPool:
+    """Fixed-size blocking pool, mirroring the app's checkout/return pattern"""
+
+    def __init__(self, dsn, size):
+        self._connections = queue.Queue()
+        for _ in range(size):
+            self._connections.put(connect(dsn))
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self):
+        while not self._connections.empty():
+            self._connections.get().close()
+
+
+def random_order(rng, products):
+    """Build the lines for a random egg, chick or mixed order"""
+    chick_skus = [sku for sku in products if sku != EGG_SKU]
+    kind = rng.choice(["egg", "chick", "mixed"])
+    lines = []
+    if kind in ("egg", "mixed"):
+        lines.append(OrderLine(EGG_SKU, rng.randint(1, 3), products[EGG_SKU][1]))
+    if kind in ("chick", "mixed"):
+        sku = rng.choice(chick_skus)
+        lines.append(OrderLine(sku, rng.randint(1, 5), products[sku][1]))
+    return kind, lines
+
+
+def run_customer(pool, products, orders_per_customer, seed, results, lock):
+    """Place a series of random orders, recording latency, outcome and confirmed quantities"""
+    rng = random.Random(seed)
+    latencies, outcomes, confirmed = [], Counter(), Counter()
+    for _ in range(orders_per_customer):
+        kind, lines = random_order(rng, products)
+        started = time.perf_counter()
+        try:
+            with pool.connection() as conn:
+                result = place_order(conn, "Load Test", f"customer{seed}@example.com", "555-0100",
+                                     lines, pickup_method="farm_pickup", payment_method="Cash")
+            outcome = result.status
+            if result.confirmed:
+                for line in lines:
+                    confirmed[line.sku] += line.quantity
+        except psycopg2.Error:
+            outcome = "error"
+        latencies.append(time.perf_counter() - started)
+        outcomes[f"{kind}:{outcome}"] += 1
+    with lock:
+        results["latencies"].extend(latencies)
+        results["outcomes"].update(outcomes)
+        results["confirmed"].update(confirmed)
+
+
+def check_invariants(dsn, initial_products, confirmed):
+    """Compare final stock against the order and transaction logs; return a list of failures"""
+    failures = []
+    conn = connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT p.sku, p.current_stock,
+                       COALESCE((SELECT SUM(oi.quantity) FROM order_items oi WHERE oi.product_id = p.id), 0),
+                       COALESCE((SELECT SUM(-it.quantity_change) FROM inventory_transactions it
+                                 WHERE it.product_id = p.id AND it.transaction_type = 'sale'), 0)
+                FROM products p
+            """)
+            for sku, stock, ordered, logged in cur.fetchall():
+                initial = initial_products[sku][0]
+                if stock < 0:
+                    failures.append(f"{sku}: negative stock {stock}")
+                if initial - ordered != stock:
+                    failures.append(f"{sku}: initial {initial} - ordered {ordered} != stock {stock}")
+                if ordered != logged:
+                    failures.append(f"{sku}: ordered {ordered} != logged sales {logged}")
+                if ordered != confirmed.get(sku, 0):
+                    failures.append(f"{sku}: ordered {ordered} != confirmed to customers {confirmed.get(sku, 0)}")
+    finally:
+        conn.close()
+    return failures
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/lmw_farm"),
+                        help="Postgres DSN; a '%s' schema is dropped and recreated in it" % BENCH_SCHEMA)
+    parser.add_argument("--customers", type=int, default=50, help="concurrent simulated customers")
+    parser.add_argument("--orders-per-customer", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=10, help="connections shared by all customers")
+    parser.add_argument("--egg-stock", type=int, default=200, help="starting dozens of eggs")
+    parser.add_argument("--chick-stock", type=int, default=40, help="starting stock per chick product")
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args()
+
+    products = seed_database(args.dsn, args.egg_stock, args.chick_stock)
+    pool = ConnectionPool(args.dsn, args.pool_size)
+    results = {"latencies": [], "outcomes": Counter(), "confirmed": Counter()}
+    lock = threading.Lock()
+    customers = [
+        threading.Thread(target=run_customer,
+                         args=(pool, products, args.orders_per_customer, args.seed + i, results, lock))
+        for i in range(args.customers)
+    ]
+
+    started = time.perf_counter()
+    for customer in customers:
+        customer.start()
+    for customer in customers:
+        customer.join()
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    latencies = results["latencies"]
+    outcomes = results["outcomes"]
+    confirmed_orders = sum(count for key, count in outcomes.items() if key.endswith(":confirmed"))
+    print(f"customers={args.customers} orders/customer={args.orders_per_customer} pool={args.pool_size}")
+    print(f"attempts: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} orders/s, "
+          f"{confirmed_orders / elapsed:.1f} confirmed/s)")
+    print(f"latency: p50={percentile(latencies, 50) * 1000:.1f}ms p99={percentile(latencies, 99) * 1000:.1f}ms "
+          f"max={max(latencies, default=0) * 1000:.1f}ms")
+    for key in sorted(outcomes):
+        print(f"  {key}: {outcomes[key]}")
+
+    failures = check_invariants(args.dsn, products, results["confirmed"])
+    if failures:
+        print("INVARIANTS FAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"invariants: OK across {len(products)} products (no oversell, order and sale logs agree)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from journal import Journal, start_replayer
+from signups import InterestSignup, SignupQueue
+
 # Page configuration
 st.set_page_config(
     page_title="LMW Farm - Coming Soon!",
@@ -81,52 +84,35 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Database configuration
-def init_database_connection():
-    """Initialize database connection"""
-    try:
-        return psycopg2.connect(**st.secrets.postgres)
-    except Exception as e:
-        st.error(f"Database connection failed: {str(e)}")
-        return None
+@st.cache_resource
+def get_signup_queue():
+    """Start the background writer for interest signups, once per server process
+
+    Signups that can't reach the database go to the offline journal, which a
+    second thread replays once it is back.
+    """
+    connection_params = dict(st.secrets.postgres)
+    connect = lambda: psycopg2.connect(**connection_params)
+    journal = Journal()
+    start_replayer(journal, connect)
+    return SignupQueue(connect, journal=journal)
 
 def save_interest_form(name, email, phone, location, interests, contact_preference, notes):
-    """Save interest form submission to database"""
-    conn = init_database_connection()
-    if not conn:
-        return False
-    
+    """Queue an interest form submission; a background worker writes it to the database in batches"""
     try:
-        with conn.cursor() as cur:
-            # Create table if it doesn't exist
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS launch_interest (
-                    id SERIAL PRIMARY KEY,
-                    submitted_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    name VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL,
-                    phone VARCHAR(50),
-                    location VARCHAR(255),
-                    interests TEXT,
-                    contact_preference VARCHAR(50),
-                    notes TEXT
-                )
-            """)
-            
-            # Insert the submission
-            cur.execute("""
-                INSERT INTO launch_interest 
-                (name, email, phone, location, interests, contact_preference, notes)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (name, email, phone, location, ', '.join(interests), contact_preference, notes))
-            
-            conn.commit()
-            return True
+        get_signup_queue().submit(InterestSignup(
+            name=name,
+            email=email,
+            phone=phone,
+            location=location,
+            interests=', '.join(interests),
+            contact_preference=contact_preference,
+            notes=notes
+        ))
+        return True
     except Exception as e:
-        conn.rollback()
         st.error(f"Error saving to database: {e}")
         return False
-    finally:
-        conn.close()
 
 def main():
     # Hero section with logo and family photo
@@ -0,0 +1,159 @@
+"""Build the shared image asset store for the Streamlit app and the React site
+
+Every image in pictures/ and lmw-farm-website/src/assets/ is resized to a
+few responsive widths and recompressed as WebP plus a JPEG (or PNG, for
+images with transparency) fallback. Files are named by a hash of the source
+bytes and build settings, so the many byte-identical copies in the two
+folders are stored once, an unchanged image is never re-encoded and a
+changed one gets new URLs - which is what lets api.py serve them as
+immutable.
+
+static/assets/manifest.json maps each source path to its object. main.py
+and the Vite build (lmw-farm-website/vite.config.js) both resolve images
+through it and fall back to the originals when the store hasn't been built.
+
+    python build_assets.py            # run before deploying either frontend
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+
+from PIL import Image, ImageOps
+
+# Paths in the manifest are relative to the repository root, with forward slashes
+SOURCE_DIRS = ("pictures", "lmw-farm-website/src/assets")
+OUTPUT_DIR = os.path.join("static", "assets")
+MANIFEST_NAME = "manifest.json"
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# 1460 is Streamlit's maximum content width (2 x 730 px for high-DPI screens)
+RESPONSIVE_WIDTHS = (480, 960, 1460)
+# Images shown at a fixed size, as (width, height) at 1x and 2x
+FIXED_SIZES = {
+    "store.jpg": ((400, 250), (800, 500)),
+    "locker.jpg": ((400, 250), (800, 500)),
+}
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+BUILD_VERSION = 1  # bump when the encoding code changes so every variant is rebuilt
+
+
+def has_alpha(image):
+    return image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+
+
+def object_hash(data, name):
+    """Hash of the source bytes and every setting that changes the output"""
+    settings = repr((BUILD_VERSION, RESPONSIVE_WIDTHS, FIXED_SIZES.get(name), JPEG_QUALITY, WEBP_QUALITY)).encode()
+    return hashlib.sha256(data + settings).hexdigest()[:16]
+
+
+def encode(image, path, image_format):
+    if image_format == "webp":
+        image.save(path, "WEBP", quality=WEBP_QUALITY, method=6)
+    elif image_format == "png":
+        # Only browsers without WebP get the PNG; a 256-colour palette keeps transparency at a fraction of the size
+        image.convert("RGBA").quantize(256, method=Image.Quantize.FASTOCTREE).save(path, "PNG", optimize=True)
+    else:
+        image.convert("RGB").save(path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+
+def build_object(source, data, digest, output_dir):
+    """Write every variant of one source image that doesn't exist yet; returns its manifest entry"""
+    name = os.path.basename(source)
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+    fallback_format = "png" if has_alpha(image) else "jpeg"
+    width, height = image.size
+
+    if name in FIXED_SIZES:
+        targets = [(size, f"{size[0]}x{size[1]}") for size in FIXED_SIZES[name]]
+    else:
+        # Skip steps within 10% of the next one up; the largest variant is capped at the original width
+        largest = min(width, RESPONSIVE_WIDTHS[-1])
+        widths = [target for target in RESPONSIVE_WIDTHS if target < largest * 0.9] + [largest]
+        targets = [((w, round(height * w / width)), f"{w}w") for w in widths]
+
+    variants = []
+    for size, label in targets:
+        resized = None
+        for image_format in ("webp", fallback_format):
+            extension = "jpg" if image_format == "jpeg" else image_format
+            file_name = f"{digest}-{label}.{extension}"
+            path = os.path.join(output_dir, file_name)
+            if not os.path.exists(path):
+                if resized is None:
+                    resized = image if size == image.size else image.resize(size, Image.LANCZOS)
+                encode(resized, path, image_format)
+            variants.append({
+                "file": file_name,
+                "format": image_format,
+                "width": size[0],
+                "height": size[1],
+                "bytes": os.path.getsize(path),
+            })
+    return {"source": source, "width": width, "height": height, "bytes": len(data), "variants": variants}
+
+
+def source_paths():
+    """Every image under SOURCE_DIRS, as sorted repository-relative paths"""
+    paths = []
+    for source_dir in SOURCE_DIRS:
+        if not os.path.isdir(source_dir):
+            continue
+        paths.extend(
+            f"{source_dir}/{name}" for name in os.listdir(source_dir)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        )
+    return sorted(paths)
+
+
+def build_assets(output_dir=OUTPUT_DIR):
+    """Build the store and its manifest, removing files no longer referenced
+
+    Returns (paths, objects): source path -> object hash, and object hash ->
+    entry. Sources with identical bytes share one object.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths, objects = {}, {}
+    for source in source_paths():
+        with open(source, "rb") as f:
+            data = f.read()
+        digest = object_hash(data, os.path.basename(source))
+        if digest not in objects:
+            objects[digest] = build_object(source, data, digest, output_dir)
+        paths[source] = digest
+
+    referenced = {variant["file"] for entry in objects.values() for variant in entry["variants"]}
+    for file_name in os.listdir(output_dir):
+        if file_name != MANIFEST_NAME and file_name not in referenced:
+            os.remove(os.path.join(output_dir, file_name))
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump({"paths": paths, "objects": objects}, f, indent=2, sort_keys=True)
+    return paths, objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the content-addressed image asset store")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    try:
+        paths, objects = build_assets(args.output_dir)
+    except OSError as e:
+        print(f"Asset build failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    source_bytes = sum(objects[digest]["bytes"] for digest in paths.values())
+    built_bytes = sum(variant["bytes"] for entry in objects.values() for variant in entry["variants"])
+    print(f"images={len(paths)} unique={len(objects)} source={source_bytes / 1e6:.1f} MB "
+          f"store={built_bytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Product catalog for the LMW Farm storefront
+
+Every sellable product (eggs, chicks, honey, butter, herbs, merch, ... - one
+product line per dim_products subcategory) with its stock, plus the breed
+profiles shown on the chickens page, as one immutable object indexed by SKU,
+product line and breed name. main.py builds it once per version of the
+inventory and shares it across pages and sessions, so the order forms are
+generated from it and a new product line needs rows in the database, not code.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+
+# Display names for product lines; lines not listed here get a title-cased subcategory
+PRODUCT_LINE_LABELS = {
+    'eggs': '🥚 Fresh Eggs',
+    'chicks': '🐣 Baby Chicks',
+    'honey': '🍯 Honey',
+    'butter': '🧈 Herb Butters',
+    'calves': '🐄 Highland Calves',
+    'herbs': '🌿 Fresh Herbs',
+    'blueberries': '🫐 Blueberries',
+    'potatoes': '🥔 Potatoes',
+    'seasonal_veg': '🥕 Seasonal Vegetables',
+    'apparel': '👕 Apparel',
+    'egg_holders': '🧺 Egg Holders',
+    'tools': '🧽 Tools',
+    'stickers': '🏷️ Stickers',
+}
+
+BREED_CATEGORIES = {
+    'egg_layers': 'Egg Layers',
+    'specialty_breeders': 'Specialty Breeders',
+}
+
+
+@dataclass(frozen=True)
+class BreedProfile:
+    """One breed in the flock, as described on the chickens page"""
+    name: str
+    category: str  # a BREED_CATEGORIES key
+    count: int
+    egg_color: str
+    temperament: str
+    image_path: str
+    description: str
+    why_chosen: str
+    special_notes: str
+
+
+BREED_PROFILES = (
+    BreedProfile(
+        name='Australorps',
+        category='egg_layers',
+        count=12,
+        egg_color='Brown',
+        temperament='Docile',
+        image_path='pictures/australorp.jpg',
+        description="Known as one of the world's best laying breeds, Australorps are calm, friendly birds that consistently produce large brown eggs. They're excellent foragers and handle confinement well.",
+        why_chosen="We chose Australorps for their incredible laying ability and gentle nature around our daughters. They're perfect for families and produce beautiful, consistent brown eggs.",
+        special_notes='Excellent layers, can lay 250+ eggs per year',
+    ),
+    BreedProfile(
+        name='Rhode Island Reds',
+        category='egg_layers',
+        count=10,
+        egg_color='Brown',
+        temperament='Hardy',
+        image_path='pictures/reds.jpg',
+        description='Classic American breed known for excellent egg production and hardiness. These reliable birds are excellent foragers and consistently productive layers.',
+        why_chosen='These are the backbone of our brown egg production. Reliable, hardy, and consistently productive - exactly what a farm needs.',
+        special_notes='Great foragers, consistent production',
+    ),
+    BreedProfile(
+        name='Golden Comets',
+        category='egg_layers',
+        count=8,
+        egg_color='Brown',
+        temperament='Friendly',
+        image_path='pictures/comet.jpg',
+        description='A hybrid breed developed for commercial egg production. Known for their exceptional laying ability and friendly disposition.',
+        why_chosen='These girls are egg-laying machines! They start laying early and produce consistently throughout the year.',
+        special_notes='Early layers, high production',
+    ),
+    BreedProfile(
+        name='Olive Eggers',
+        category='egg_layers',
+        count=6,
+        egg_color='Olive Green',
+        temperament='Calm',
+        image_path='pictures/eggers.jpg',
+        description='A hybrid breed created by crossing dark brown egg layers with blue egg layers, resulting in beautiful olive-colored eggs. Calm, productive layers.',
+        why_chosen='The olive green eggs are incredible for our rainbow dozens. Customers are always amazed by the unique color.',
+        special_notes='Unique olive green eggs, great for rainbow dozens',
+    ),
+    BreedProfile(
+        name='Starlight Green Eggers',
+        category='egg_layers',
+        count=5,
+        egg_color='Green',
+        temperament='Friendly',
+        image_path='pictures/starlight.jpg',
+        description='A newer breed development that consistently lays green eggs. Friendly, productive birds that add beautiful color variety to egg collections.',
+        why_chosen='Another green egg variety that helps us create those stunning rainbow dozen collections that customers love.',
+        special_notes='Rare green eggs, consistent layers',
+    ),
+    BreedProfile(
+        name='Jersey Giants',
+        category='egg_layers',
+        count=4,
+        egg_color='Brown',
+        temperament='Gentle',
+        image_path='pictures/jerseys.jpg',
+        description="America's largest chicken breed! These gentle giants are calm, friendly birds that lay large brown eggs. Despite their size, they're excellent foragers.",
+        why_chosen="The kids love these gentle giants! They're incredibly calm and their extra-large eggs are perfect for baking.",
+        special_notes='Largest chicken breed, extra-large eggs',
+    ),
+    BreedProfile(
+        name='Sapphire Gems',
+        category='egg_layers',
+        count=7,
+        egg_color='Brown',
+        temperament='Active',
+        image_path='pictures/gems.jpg',
+        description='A newer breed with beautiful blue-gray feathering. Active foragers that lay consistently and handle free-range life very well.',
+        why_chosen="Their beautiful blue-gray coloring caught our eye, and they're excellent free-range birds that fit perfectly with our farming style.",
+        special_notes='Beautiful blue-gray feathers, excellent foragers',
+    ),
+    BreedProfile(
+        name='Cinnamon Queens',
+        category='egg_layers',
+        count=9,
+        egg_color='Brown',
+        temperament='Calm',
+        image_path='pictures/queens.jpg',
+        description='A hybrid breed known for exceptional egg production and beautiful reddish-brown feathering. Calm, productive birds that adapt well to various conditions.',
+        why_chosen="Their cinnamon-colored feathers are gorgeous, and they're incredibly productive layers that handle our climate well.",
+        special_notes='Beautiful cinnamon coloring, high production',
+    ),
+    BreedProfile(
+        name='Barred Rocks',
+        category='egg_layers',
+        count=8,
+        egg_color='Brown',
+        temperament='Friendly',
+        image_path='pictures/barredrock.jpg',
+        description='Classic American breed known for their distinctive black and white striped feathers. Hardy, cold-resistant birds that are great for free-ranging.',
+        why_chosen="These girls are tough as nails and handle our North Carolina weather beautifully. The kids love their distinctive 'barred' pattern.",
+        special_notes='Cold hardy, great for beginners',
+    ),
+    BreedProfile(
+        name='Buff Orpington',
+        category='egg_layers',
+        count=6,
+        egg_color='Brown',
+        temperament='Docile',
+        image_path='pictures/BO.jpg',
+        description='Known for their beautiful golden buff color and incredibly gentle nature. These fluffy birds are excellent mothers and consistent layers.',
+        why_chosen="The most gentle, cuddly chickens you'll ever meet! The girls love holding these sweet birds, and they're great with children.",
+        special_notes='Extremely gentle, great with kids',
+    ),
+    BreedProfile(
+        name='Midnight Majestics',
+        category='egg_layers',
+        count=5,
+        egg_color='Brown',
+        temperament='Calm',
+        image_path='pictures/majesty.jpg',
+        description='A newer breed with striking dark plumage and excellent laying ability. Calm birds that adapt well to free-range environments.',
+        why_chosen="Their dramatic dark feathers make them stand out in the flock, and they're reliable layers with great temperaments.",
+        special_notes='Striking dark plumage, reliable layers',
+    ),
+    BreedProfile(
+        name='Black Sex Link',
+        category='egg_layers',
+        count=7,
+        egg_color='Brown',
+        temperament='Active',
+        image_path='pictures/bsl.jpg',
+        description='A hybrid breed created by crossing specific breeds to create sex-linked chicks that can be sexed at hatching. Known for excellent egg production and hardiness.',
+        why_chosen="These girls are incredibly productive layers and the sex-linking trait made them easier to manage as chicks. They're reliable brown egg producers.",
+        special_notes='Sex-linked breed, excellent production',
+    ),
+    BreedProfile(
+        name='Zombies (Legbar/Ayam Mix)',
+        category='egg_layers',
+        count=4,
+        egg_color='Blue/Green',
+        temperament='Unique',
+        image_path='pictures/zombie.jpg',
+        description='Our own designer mix combining Cream Legbar genetics with Ayam Cemani. These unique birds produce colorful eggs with interesting genetic combinations.',
+        why_chosen="This is our experimental breeding project turned production layer. We're working on developing our own unique line with interesting egg colors and patterns.",
+        special_notes='Our custom breeding project, unique genetics',
+    ),
+    BreedProfile(
+        name='Barnyard Mixes',
+        category='egg_layers',
+        count=12,
+        egg_color='Mixed',
+        temperament='Varied',
+        image_path='pictures/barnyard.jpg',
+        description='Various mixed breed chickens that combine the best traits of multiple breeds. Each bird is unique with its own personality and egg characteristics.',
+        why_chosen="These girls represent the best of all worlds - hybrid vigor, unique appearances, and surprise egg colors. They're our 'wild cards.'",
+        special_notes='Hybrid vigor, unique combinations',
+    ),
+    BreedProfile(
+        name='Black Copper Marans',
+        category='specialty_breeders',
+        count=8,
+        egg_color='Dark Brown/Chocolate',
+        temperament='Calm',
+        image_path='pictures/marans.jpg',
+        description="French breed famous for laying the darkest brown eggs of any chicken breed. The eggs are so dark they're often called 'chocolate eggs.'",
+        why_chosen='The chocolate-colored eggs are absolutely stunning and add incredible visual appeal to our rainbow dozens. Customers are blown away by how dark they are.',
+        special_notes='Darkest brown eggs in the world',
+    ),
+    BreedProfile(
+        name='Americanas',
+        category='specialty_breeders',
+        count=10,
+        egg_color='Blue/Green',
+        temperament='Gentle',
+        image_path='pictures/jimbo.jpg',
+        description="Often called 'Easter Eggers,' these friendly birds lay eggs in various shades of blue and green. Each hen's eggs are a slightly different shade.",
+        why_chosen='The variety of blue and green shades makes every collection exciting. Perfect for our breeding program to maintain colorful egg genetics.',
+        special_notes='Easter eggers, variety of blue/green shades',
+    ),
+    BreedProfile(
+        name='Barred Rock/Rustic Rock',
+        category='specialty_breeders',
+        count=6,
+        egg_color='Brown',
+        temperament='Friendly',
+        image_path='pictures/barredrock.jpg',
+        description='Classic American breed selected for breeding purposes. These birds carry excellent genetics for hardiness, productivity, and temperament.',
+        why_chosen="We're using these for our breeding program because of their proven genetics, hardiness, and excellent maternal instincts.",
+        special_notes='Selected breeding stock, excellent mothers',
+    ),
+    BreedProfile(
+        name='Cream Legbars',
+        category='specialty_breeders',
+        count=5,
+        egg_color='Blue',
+        temperament='Active',
+        image_path='pictures/legbar.jpg',
+        description="A rare auto-sexing breed that lays beautiful blue eggs. Active foragers with a distinctive crest, they're excellent free-range birds.",
+        why_chosen='The blue eggs are stunning, and being auto-sexing makes breeding much easier. These are key to our blue egg genetics.',
+        special_notes='Auto-sexing breed, rare blue eggs',
+    ),)
+
+
+@dataclass(frozen=True)
+class CatalogProduct:
+    """A sellable product with its stock on hand"""
+    id: int
+    sku: str
+    name: str
+    description: str
+    category: str
+    subcategory: str  # the product line
+    price: float
+    current_stock: int
+    updated_date: datetime = None
+    breed: str = None
+    product_type: str = None
+    size: str = None
+
+    @property
+    def label(self):
+        return f"{self.name} - ${self.price:.2f}"
+
+    @property
+    def inquiry_only(self):
+        """Listed without a price (calves): customers contact us instead of ordering"""
+        return not self.price or self.price <= 0
+
+    @property
+    def orderable(self):
+        return not self.inquiry_only and self.current_stock > 0
+
+
+def product_line_label(subcategory):
+    """Display name for a product line"""
+    return PRODUCT_LINE_LABELS.get(subcategory, subcategory.replace('_', ' ').title())
+
+
+class ProductCatalog:
+    """Immutable, indexed view of every active product and the breed profiles"""
+
+    def __init__(self, products, breeds=BREED_PROFILES):
+        self.products = tuple(CatalogProduct(**product) for product in products)
+        self.by_sku = MappingProxyType({product.sku: product for product in self.products})
+        # Product lines in the order their first product appears
+        lines = {}
+        for product in self.products:
+            lines.setdefault(product.subcategory, []).append(product)
+        self.lines = MappingProxyType({line: tuple(products) for line, products in lines.items()})
+        self.breeds = tuple(breeds)
+        self.by_breed = MappingProxyType({breed.name: breed for breed in self.breeds})
+        self._breeds_by_category = MappingProxyType({
+            category: tuple(breed for breed in self.breeds if breed.category == category)
+            for category in BREED_CATEGORIES
+        })
+
+    def products_in(self, line):
+        """Every product in one product line, in display order"""
+        return self.lines.get(line, ())
+
+    def orderable_in(self, line):
+        """Products in a line that can be ordered right now"""
+        return tuple(product for product in self.products_in(line) if product.orderable)
+
+    def price_range(self, line):
+        """(lowest, highest) price of the orderable products in a line, or None"""
+        prices = [product.price for product in self.orderable_in(line)]
+        return (min(prices), max(prices)) if prices else None
+
+    @property
+    def orderable_lines(self):
+        """Product lines with at least one orderable product"""
+        return tuple(line for line in self.lines if self.orderable_in(line))
+
+    def breeds_in(self, category):
+        """Breed profiles in one BREED_CATEGORIES category, in display order"""
+        return self._breeds_by_category[category]
+
+    def flock_size(self, category=None):
+        """Number of birds in a category, or in the whole flock"""
+        breeds = self.breeds if category is None else self.breeds_in(category)
+        return sum(breed.count for breed in breeds)
@@ -0,0 +1,25 @@
+"""Contact form write path for the LMW Farm storefront
+
+Kept free of Streamlit so the contact form in main.py and the offline
+journal replayer (journal.py) save messages the same way.
+"""
+from datetime import datetime
+
+
+def insert_contact_message(cur, name, email, subject, message, submitted_at=None):
+    """Add one contact form message to contact_submissions using an open cursor"""
+    cur.execute("""
+        INSERT INTO contact_submissions (name, email, subject, message, submitted_at)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (name, email, subject, message, submitted_at or datetime.now()))
+
+
+def save_contact_message(conn, name, email, subject, message, submitted_at=None):
+    """Save a contact form message in its own transaction"""
+    try:
+        with conn.cursor() as cur:
+            insert_contact_message(cur, name, email, subject, message, submitted_at)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
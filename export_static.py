@@ -0,0 +1,306 @@
+"""Static export of the LMW Farm marketing pages
+
+Renders the home, chickens, subscription and contact pages of main.py
+headlessly (with Streamlit's AppTest), converts what they draw to plain
+HTML and writes it, with main.py's CSS block and the images the pages use,
+to a directory any static web server or CDN can serve. Visitors to those
+pages never open a Streamlit session; ordering, pickup and admin stay in the
+live app, and the exported buttons and forms link there (main.py's ?page=).
+
+The pages show live stock figures, so re-export on a schedule, e.g. every
+five minutes from cron. Pages are replaced atomically, so it is safe to
+export into a directory that is being served.
+
+    python build_assets.py
+    DATABASE_URL=postgresql://localhost/lmw_farm python export_static.py export --app-url https://order.lmwfarm.com
+    python export_static.py serve --port 8080
+"""
+import argparse
+import html
+import os
+import re
+import shutil
+import sys
+import tempfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import markdown
+from psycopg2.extensions import parse_dsn
+
+MAIN_SCRIPT = "main.py"
+ASSET_DIR = os.path.join("static", "assets")
+OUTPUT_DIR = "site"
+ASSET_URL_PREFIX = "/assets"  # root-relative, so pages in subdirectories share the same image URLs
+HTML_CACHE_SECONDS = 60  # exported pages change on every export; images never do
+
+# Output file -> (main.py PAGE_SLUGS key, title)
+STATIC_PAGES = {
+    "index.html": ("home", "Home & Our Story"),
+    "chickens.html": ("chickens", "Our Chickens & Breeds"),
+    "subscription.html": ("subscription", "Egg Subscription Service"),
+    "contact.html": ("contact", "Contact Us"),
+}
+NAV_LINKS = [
+    ("Home", "/index.html"),
+    ("Our Chickens", "/chickens.html"),
+    ("Subscriptions", "/subscription.html"),
+    ("Contact", "/contact.html"),
+    ("Order Online", "live:order"),
+    ("Pickup Locations", "live:pickup"),
+]
+# Button label -> link; "live:<slug>" links into the Streamlit app
+BUTTON_LINKS = {
+    "🛒 Order Fresh Eggs": "live:order",
+    "🥚 Order Fresh Eggs": "live:order",
+    "🐣 Browse Baby Chicks": "live:order",
+    "📦 Learn About Subscriptions": "/subscription.html",
+    "🐔 Meet Our Chickens": "/chickens.html",
+}
+# Forms can't be submitted from a static page; each becomes a link to the same form in the app
+FORM_LINKS = {
+    "subscription_interest": "live:subscription",
+    "contact_form": "live:contact",
+}
+BREED_BUTTON_PREFIXES = ("layer_", "breeder_")
+
+# Layout for the converted elements; main.py's own CSS block is included as well
+EXPORT_CSS = """
+body { margin: 0; background-color: #e6f3ff; color: #31333f; font-family: "Source Sans Pro", sans-serif; line-height: 1.6; }
+nav { display: flex; flex-wrap: wrap; gap: 1.5rem; padding: 0.75rem 1.5rem; background: #2c3e50; }
+nav a { color: #fff; text-decoration: none; font-weight: 600; }
+main { max-width: 1100px; margin: 0 auto; padding: 1.5rem; }
+img { max-width: 100%; height: auto; }
+.row { display: flex; flex-wrap: wrap; gap: 1rem; }
+.column { min-width: 240px; }
+.alert { padding: 0.75rem 1rem; border-radius: 0.5rem; margin: 0.5rem 0; }
+.alert-info { background: #e0ecff; } .alert-success { background: #dff5e3; }
+.alert-warning { background: #fff6d6; } .alert-error { background: #ffe3e3; }
+.metric-label { font-size: 0.9em; color: #555; } .metric-value { font-size: 2em; } .metric-delta { color: #2e7d32; }
+.button { display: block; margin: 0.5rem 0; padding: 0.5rem 1rem; border: 1px solid #ccc; border-radius: 0.5rem;
+          background: #fff; color: #31333f; text-align: center; text-decoration: none; }
+.button.primary { background: #ff4b4b; border-color: #ff4b4b; color: #fff; }
+.tab-label { border-bottom: 2px solid #ff4b4b; display: inline-block; }
+.form-link { padding: 1rem; border: 1px solid #ddd; border-radius: 0.5rem; background: #fff; }
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} - LMW Farm</title>
+<style>{export_css}</style>
+{app_css}
+</head>
+<body>
+<nav>{nav}</nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class PageRenderer:
+    """Converts one AppTest element tree to HTML"""
+
+    def __init__(self, app_url, page_slug):
+        self.app_url = app_url.rstrip("/")
+        self.page_slug = page_slug
+        self.app_css = []
+        self.errors = []
+
+    def link(self, target):
+        if target.startswith("live:"):
+            return f"{self.app_url}/?page={target[len('live:'):]}"
+        return target
+
+    def markdown(self, text, allow_html=True):
+        if "<style>" in text:
+            self.app_css.append(text)
+            return ""
+        if not allow_html:
+            text = text.replace("<", "&lt;")
+        return markdown.markdown(text, extensions=["tables", "fenced_code", "sane_lists"])
+
+    def render(self, node):
+        kind = type(node).__name__
+        if kind in ("SpecialBlock", "Block"):
+            return self.render_block(node)
+        if kind == "Column":
+            return f'<div class="column" style="flex: {node.weight:g} 1 0">{self.render_children(node)}</div>'
+        if kind == "Tab":
+            return (f'<section class="tab"><h3 class="tab-label">{html.escape(node.label)}</h3>'
+                    f'{self.render_children(node)}</section>')
+        if kind == "Markdown":
+            return self.markdown(node.value, node.proto.allow_html)
+        if kind == "Caption":
+            return f'<p class="caption">{self.markdown(node.value)}</p>'
+        if kind == "Divider":
+            return "<hr>"
+        if kind in ("Info", "Success", "Warning", "Error"):
+            if kind == "Error":
+                self.errors.append(node.value)
+            return f'<div class="alert alert-{kind.lower()}">{self.markdown(node.value)}</div>'
+        if kind == "Metric":
+            delta = f'<div class="metric-delta">{html.escape(node.delta)}</div>' if node.delta else ""
+            return (f'<div class="metric"><div class="metric-label">{html.escape(node.label)}</div>'
+                    f'<div class="metric-value">{html.escape(node.value)}</div>{delta}</div>')
+        if kind == "Button":
+            return self.render_button(node)
+        print(f"{self.page_slug}: skipping unsupported element {kind}", file=sys.stderr)
+        return ""
+
+    def render_children(self, node):
+        return "".join(self.render(child) for child in node.children.values())
+
+    def render_block(self, node):
+        if node.type == "form":
+            return self.render_form(node)
+        if node.type == "tab_container":
+            return f'<div class="tabs">{self.render_children(node)}</div>'
+        if node.type == "expandable":
+            label = html.escape(node.proto.expandable.label)
+            return f"<details><summary>{label}</summary>{self.render_children(node)}</details>"
+        if node.type == "flex_container" and node.proto.flex_container.direction == node.proto.flex_container.HORIZONTAL:
+            return f'<div class="row">{self.render_children(node)}</div>'
+        return f"<div>{self.render_children(node)}</div>"
+
+    def render_button(self, node):
+        key = node.key or ""
+        if key.startswith(BREED_BUTTON_PREFIXES):
+            # Every breed's details are exported as their own page
+            href = f"/chickens/{slugify(key.split('_', 1)[1])}.html"
+        else:
+            href = self.link(BUTTON_LINKS.get(node.label, f"live:{self.page_slug}"))
+        css_class = "button primary" if node.proto.type == "primary" else "button"
+        return f'<a class="{css_class}" href="{html.escape(href)}">{html.escape(node.label)}</a>'
+
+    def render_form(self, node):
+        form_id = node.proto.form.form_id
+        submit = next((child for child in node.children.values() if type(child).__name__ == "Button"), None)
+        label = submit.label if submit else "Open the form"
+        href = self.link(FORM_LINKS.get(form_id, f"live:{self.page_slug}"))
+        return (f'<div class="form-link"><p>This form is on our online store.</p>'
+                f'<a class="button primary" href="{html.escape(href)}">{html.escape(label)}</a></div>')
+
+    def page(self, title, root):
+        body = self.render(root)
+        nav = "".join(f'<a href="{html.escape(self.link(href))}">{label}</a>' for label, href in NAV_LINKS)
+        return PAGE_TEMPLATE.format(
+            title=html.escape(title), export_css=EXPORT_CSS, app_css="\n".join(self.app_css), nav=nav, body=body
+        )
+
+
+def render_pages(app_url, secrets):
+    """Render every exported page; returns {relative path: html}"""
+    from streamlit.testing.v1 import AppTest
+
+    pages = {}
+    for file_name, (slug, title) in STATIC_PAGES.items():
+        app = AppTest.from_file(MAIN_SCRIPT, default_timeout=120)
+        app.secrets.update(secrets)
+        app.query_params["page"] = slug
+        app.run()
+        pages[file_name] = checked_page(app, app_url, slug, title, file_name)
+
+        if file_name == "chickens.html":
+            breed_keys = [button.key for button in app.button if (button.key or "").startswith(BREED_BUTTON_PREFIXES)]
+            for key in breed_keys:
+                app.button(key=key).click().run()
+                breed = key.split("_", 1)[1]
+                pages[f"chickens/{slugify(breed)}.html"] = checked_page(
+                    app, app_url, slug, f"{breed} - {title}", f"chickens/{slugify(breed)}.html"
+                )
+    return pages
+
+
+def checked_page(app, app_url, slug, title, file_name):
+    """HTML for the app's current page; refuses to publish a page that raised or showed an error"""
+    if app.exception:
+        raise RuntimeError(f"{file_name} raised: {app.exception[0].value}")
+    renderer = PageRenderer(app_url, slug)
+    page_html = renderer.page(title, app.main)
+    if renderer.errors:
+        raise RuntimeError(f"{file_name} rendered an error: {renderer.errors[0]}")
+    return page_html
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path) or ".", delete=False) as f:
+        f.write(data)
+    os.replace(f.name, path)
+
+
+def export_site(app_url, secrets, output_dir=OUTPUT_DIR):
+    """Render the pages and write them plus the images they reference; returns (pages, images) written"""
+    if not os.path.exists(os.path.join(ASSET_DIR, "manifest.json")):
+        raise RuntimeError("the image store hasn't been built - run python build_assets.py first")
+    secrets = {**secrets, "assets": {"base_url": ASSET_URL_PREFIX}}
+    pages = render_pages(app_url, secrets)
+
+    # Images first, so no page is published before the files it points at
+    pattern = re.compile(re.escape(ASSET_URL_PREFIX) + r"/([\w.-]+)")
+    images = sorted({name for page_html in pages.values() for name in pattern.findall(page_html)})
+    for name in images:
+        target = os.path.join(output_dir, "assets", name)
+        if not os.path.exists(target):  # store files are content-addressed, so an existing copy is current
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(ASSET_DIR, name), target)
+    for path, page_html in pages.items():
+        write_atomic(os.path.join(output_dir, path), page_html.encode())
+    return pages, images
+
+
+class StaticSiteHandler(SimpleHTTPRequestHandler):
+    """Serves the exported site; images are content-addressed and cached for good"""
+
+    def end_headers(self):
+        if self.path.startswith(ASSET_URL_PREFIX + "/"):
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", f"public, max-age={HTML_CACHE_SECONDS}")
+        super().end_headers()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the marketing pages to static HTML, or serve them")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="render the pages into --output-dir")
+    export_parser.add_argument("--app-url", default=os.environ.get("LMW_APP_URL", "http://localhost:8501"),
+                               help="public URL of the live Streamlit app")
+    export_parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/lmw_farm"))
+    export_parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    serve_parser = subparsers.add_parser("serve", help="serve --output-dir over HTTP")
+    serve_parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        handler = partial(StaticSiteHandler, directory=args.output_dir)
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        print(f"Serving {args.output_dir} on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        pages, images = export_site(args.app_url, {"postgres": parse_dsn(args.dsn)}, args.output_dir)
+    except RuntimeError as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"pages={len(pages)} images={len(images)} output={args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
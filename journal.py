@@ -0,0 +1,293 @@
+"""Offline journal for storefront writes made while Postgres is unreachable
+
+The farm's internet drops out; customers shouldn't notice. When an order,
+contact message or launch-interest signup can't reach the database, main.py
+and branch2.py append it to a local SQLite file instead (WAL mode with
+synchronous=FULL, so every append is fsync'd before the customer sees a
+confirmation). A background replayer pushes entries to Postgres once it is
+reachable again, oldest first.
+
+Replay is idempotent, so an entry that was half-sent when the connection
+dropped, or is replayed by two app processes sharing the file, is written
+exactly once:
+  - orders carry the order number given to the customer, and
+    orders.order_number is unique (see orders.place_order)
+  - contact messages claim their entry key in journal_replays in the same
+    transaction ("-- LMW FARM - OFFLINE JOURNAL.pgsql")
+  - signups are an upsert on email that never overwrites a newer answer
+
+Entries are never deleted; a replayed entry records its outcome. Orders whose
+stock sold out before they could be replayed end as 'sold_out' and need a
+call to the customer - `status` lists them.
+
+    python journal.py status
+    python journal.py replay --dsn postgresql://localhost/lmw_farm
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+import psycopg2
+
+from contact import insert_contact_message
+from orders import OrderLine, place_order
+from signups import InterestSignup, upsert_interest_signups
+
+JOURNAL_PATH = os.environ.get("LMW_JOURNAL_PATH", "offline_journal.sqlite3")
+REPLAY_INTERVAL = 30  # seconds between checks for pending entries
+REPLAY_BATCH_SIZE = 100  # entries replayed per pass at most
+MAX_REPLAY_ATTEMPTS = 5  # entries that keep failing for non-connection reasons are left for a person
+MAX_RETRY_DELAY = 300  # seconds between connection attempts at most while the database is down
+
+# Errors that mean "the database is unreachable", as opposed to a problem with one entry
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """One journaled write waiting to be replayed"""
+    id: int
+    entry_key: str
+    kind: str
+    payload: dict
+    created_at: str
+    attempts: int
+
+
+def encode_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"can't journal {type(value).__name__}")
+
+
+class Journal:
+    """Append-only SQLite journal, safe to share between threads"""
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entry_key TEXT NOT NULL UNIQUE,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    replayed_at TEXT,
+                    outcome TEXT
+                )
+            """)
+
+    def append(self, kind, payload, entry_key=None):
+        """Durably record one write; returns its entry key"""
+        entry_key = entry_key or uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO entries (entry_key, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                (entry_key, kind, json.dumps(payload, default=encode_value), datetime.now().isoformat())
+            )
+        return entry_key
+
+    def pending(self, limit=REPLAY_BATCH_SIZE, after_id=0):
+        """Entries not yet replayed, oldest first, skipping those that failed too often"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT id, entry_key, kind, payload, created_at, attempts FROM entries
+                WHERE replayed_at IS NULL AND attempts < ? AND id > ?
+                ORDER BY id LIMIT ?
+            """, (MAX_REPLAY_ATTEMPTS, after_id, limit)).fetchall()
+        return [JournalEntry(id, key, kind, json.loads(payload), created_at, attempts)
+                for id, key, kind, payload, created_at, attempts in rows]
+
+    def mark_replayed(self, entry, outcome):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET replayed_at = ?, outcome = ?, last_error = NULL WHERE id = ?",
+                (datetime.now().isoformat(), outcome, entry.id)
+            )
+
+    def mark_failed(self, entry, error):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (str(error), entry.id)
+            )
+
+    def summary(self):
+        """Count of entries per (kind, state), where state is pending, failed or a replay outcome"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT kind,
+                       CASE WHEN replayed_at IS NOT NULL THEN outcome
+                            WHEN attempts >= ? THEN 'failed' ELSE 'pending' END AS state,
+                       COUNT(*)
+                FROM entries GROUP BY 1, 2 ORDER BY 1, 2
+            """, (MAX_REPLAY_ATTEMPTS,)).fetchall()
+        return {(kind, state): count for kind, state, count in rows}
+
+    def needing_attention(self):
+        """Replayed orders that sold out and entries that gave up, with their payloads"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT entry_key, kind, payload, COALESCE(outcome, 'failed'), last_error FROM entries
+                WHERE outcome = 'sold_out' OR (replayed_at IS NULL AND attempts >= ?)
+                ORDER BY id
+            """, (MAX_REPLAY_ATTEMPTS,)).fetchall()
+        return [(key, kind, json.loads(payload), state, error) for key, kind, payload, state, error in rows]
+
+
+def claim_entry(cur, entry):
+    """Record in Postgres that an entry is being replayed; False if it already was"""
+    cur.execute("""
+        INSERT INTO journal_replays (entry_key, kind) VALUES (%s, %s)
+        ON CONFLICT (entry_key) DO NOTHING
+        RETURNING entry_key
+    """, (entry.entry_key, entry.kind))
+    return cur.fetchone() is not None
+
+
+def replay_order(conn, entry):
+    order = dict(entry.payload)
+    lines = [OrderLine(line['sku'], line['quantity'], Decimal(line['unit_price'])) for line in order.pop('lines')]
+    return place_order(conn, lines=lines, **order).status
+
+
+def replay_contact(conn, entry):
+    message = dict(entry.payload)
+    message['submitted_at'] = datetime.fromisoformat(message['submitted_at'])
+    try:
+        with conn.cursor() as cur:
+            if not claim_entry(cur, entry):
+                conn.rollback()
+                return 'duplicate'
+            insert_contact_message(cur, **message)
+        conn.commit()
+        return 'saved'
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def replay_signup(conn, entry):
+    signup = dict(entry.payload)
+    signup['submitted_date'] = datetime.fromisoformat(signup['submitted_date'])
+    upsert_interest_signups(conn, [InterestSignup(**signup)])
+    return 'saved'
+
+
+REPLAY_HANDLERS = {
+    'order': replay_order,
+    'contact': replay_contact,
+    'signup': replay_signup,
+}
+
+
+def replay_pending(journal, conn):
+    """Replay every pending entry in order; returns {outcome: count}
+
+    Stops at the first connection error, leaving that entry and the rest for
+    the next pass. Any other error counts as a failed attempt at that entry.
+    """
+    outcomes = {}
+    last_id = 0
+    while True:
+        # Each pass tries an entry once; one that errors waits for the next pass
+        entries = journal.pending(after_id=last_id)
+        if not entries:
+            return outcomes
+        last_id = entries[-1].id
+        for entry in entries:
+            try:
+                outcome = REPLAY_HANDLERS[entry.kind](conn, entry)
+            except CONNECTION_ERRORS:
+                raise
+            except Exception as e:
+                journal.mark_failed(entry, e)
+                outcomes['error'] = outcomes.get('error', 0) + 1
+                continue
+            journal.mark_replayed(entry, outcome)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+
+def run_replayer(journal, connect, interval=REPLAY_INTERVAL):
+    """Replay pending entries forever; connect is a zero-argument callable returning a new connection"""
+    retry_delay = interval
+    while True:
+        time.sleep(retry_delay)
+        if not journal.pending(limit=1):
+            continue
+        conn = None
+        try:
+            conn = connect()
+            replay_pending(journal, conn)
+            retry_delay = interval
+        except Exception:
+            retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_replayer(journal, connect, interval=REPLAY_INTERVAL):
+    """Start run_replayer on a daemon thread"""
+    replayer = threading.Thread(target=run_replayer, args=(journal, connect, interval),
+                                name="journal-replayer", daemon=True)
+    replayer.start()
+    return replayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay the offline journal")
+    parser.add_argument("command", choices=["status", "replay"])
+    parser.add_argument("--journal", default=JOURNAL_PATH, help="journal file (default: $LMW_JOURNAL_PATH)")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.journal):
+        print(f"No journal at {args.journal}")
+        return
+    journal = Journal(args.journal)
+
+    if args.command == "replay":
+        if not args.dsn:
+            parser.error("--dsn or DATABASE_URL is required")
+        try:
+            conn = psycopg2.connect(args.dsn)
+            try:
+                outcomes = replay_pending(journal, conn)
+            finally:
+                conn.close()
+        except psycopg2.Error as e:
+            print(f"Replay failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(", ".join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items())) or "nothing to replay")
+
+    for (kind, state), count in journal.summary().items():
+        print(f"{kind:<8} {state:<10} {count}")
+    for key, kind, payload, state, error in journal.needing_attention():
+        who = payload.get('customer_name') or payload.get('name')
+        contact = payload.get('customer_phone') or payload.get('customer_email') or payload.get('email')
+        print(f"  {state}: {kind} {key} - {who} ({contact}){f' - {error}' if error else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,41 @@
+import fs from 'node:fs'
+import path from 'node:path'
+import { fileURLToPath } from 'node:url'
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Shared image store built by build_assets.py in the repository root
+const REPO_ROOT = fileURLToPath(new URL('..', import.meta.url))
+const ASSET_MANIFEST = path.join(REPO_ROOT, 'static', 'assets', 'manifest.json')
+// api.py serves the store with immutable cache headers, so the Streamlit app
+// and this site share one browser/proxy cache entry per image
+const ASSET_BASE_URL = (process.env.VITE_ASSET_BASE_URL || 'http://127.0.0.1:8000/assets').replace(/\/$/, '')
+
+// Resolves `import img from '../assets/x.jpg'` to the largest pre-sized
+// JPEG/PNG in the store; images missing from the manifest (or every image,
+// when the store hasn't been built) fall through to Vite's own asset handling
+function assetStore() {
+  let manifest = null
+
+  return {
+    name: 'lmw-asset-store',
+    enforce: 'pre',
+    buildStart() {
+      manifest = fs.existsSync(ASSET_MANIFEST) ? JSON.parse(fs.readFileSync(ASSET_MANIFEST, 'utf8')) : null
+      if (manifest) this.addWatchFile(ASSET_MANIFEST)
+    },
+    load(id) {
+      if (!manifest || id.includes('?')) return null
+      const source = path.relative(REPO_ROOT, id).split(path.sep).join('/')
+      const entry = manifest.objects[manifest.paths[source]]
+      if (!entry) return null
+      const fallback = entry.variants.filter((variant) => variant.format !== 'webp').at(-1)
+      return `export default ${JSON.stringify(`${ASSET_BASE_URL}/${fallback.file}`)}`
+    },
+  }
+}
+
 // https://vite.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [assetStore(), react()],
 })
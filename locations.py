@@ -0,0 +1,184 @@
+"""Pickup locations for the LMW Farm storefront
+
+One list of locations drives the order forms' pickup options, the pickup
+map and the "find my nearest pickup" lookup. It is read from dim_locations
+(see "-- LMW FARM - PICKUP LOCATIONS.pgsql"); DEFAULT_PICKUP_LOCATIONS is
+the same seed data, used when the database can't be reached.
+"""
+import math
+
+from psycopg2.extras import RealDictCursor
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Keep in sync with the seed in "-- LMW FARM - PICKUP LOCATIONS.pgsql"
+DEFAULT_PICKUP_LOCATIONS = (
+    {
+        'code': 'farm_pickup', 'name': 'LMW Farm', 'icon': '🏡', 'category': 'farm',
+        'address': '193 Caterpillar Trail', 'city': 'Mt Airy', 'state': 'NC',
+        'lat': 36.4580, 'lon': -80.6140,
+        'status': 'Home Base', 'details': 'Fresh eggs collected daily from our free-range chickens',
+        'hours': 'Dawn to Dusk, 7 days a week', 'distance': '0 miles',
+        'offered': True, 'pickup_description': 'By appointment (24hr notice)', 'fee': 0.00
+    },
+    # Active Farmers Markets
+    {
+        'code': 'farmers_market', 'name': 'Mount Airy Farmers Market', 'icon': '🌾', 'category': 'active_market',
+        'address': '232 W. Independence Blvd.', 'city': 'Mount Airy', 'state': 'NC',
+        'lat': 36.4993, 'lon': -80.6081,
+        'status': 'Active - Fridays', 'details': 'Our primary Friday morning market location',
+        'hours': 'Fridays 9:00 AM - 12:00 PM (April-September)', 'distance': '4-7 miles from farm',
+        'offered': True, 'pickup_description': 'Fridays 9:00 AM - 12:00 PM', 'fee': 0.00
+    },
+    {
+        'code': 'dobson_market', 'name': 'Dobson Farmers Market', 'icon': '🌾', 'category': 'active_market',
+        'address': '903 East Atkins Street', 'city': 'Dobson', 'state': 'NC',
+        'lat': 36.3970, 'lon': -80.7240,
+        'status': 'Active - Fridays', 'details': 'Our Friday afternoon market location',
+        'hours': 'Fridays 3:00 PM - 6:00 PM (May-September)', 'distance': '12-15 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    # Strategic Pickup Locations
+    {
+        'code': 'mayberry_mall', 'name': 'Mayberry Mall', 'icon': '🏬', 'category': 'pickup_location',
+        'address': '388 Frederick Street', 'city': 'Mount Airy', 'state': 'NC',
+        'lat': 36.5089, 'lon': -80.6170,
+        'status': 'Coming Soon', 'details': 'Primary pickup hub serving five counties',
+        'hours': 'TBD - Regional shopping center', 'distance': '5-8 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    {
+        'code': 'mount_airy_library', 'name': 'Mount Airy Public Library', 'icon': '📚', 'category': 'pickup_location',
+        'address': '145 Rockford Street', 'city': 'Mount Airy', 'state': 'NC',
+        'lat': 36.4889, 'lon': -80.6070,
+        'status': 'Coming Soon', 'details': 'Downtown community gathering place',
+        'hours': 'TBD - Library hours', 'distance': '4-7 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    {
+        'code': 'pilot_mountain_library', 'name': 'Pilot Mountain Library', 'icon': '🏔️', 'category': 'pickup_location',
+        'address': '319 West Main Street', 'city': 'Pilot Mountain', 'state': 'NC',
+        'lat': 36.3856, 'lon': -80.4700,
+        'status': 'Coming Soon', 'details': 'Serving eastern Surry County',
+        'hours': 'TBD - Library hours', 'distance': '15-18 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    {
+        'code': 'surry_cc', 'name': 'Surry Community College', 'icon': '🎓', 'category': 'pickup_location',
+        'address': '612 East Main Street', 'city': 'Pilot Mountain', 'state': 'NC',
+        'lat': 36.3889, 'lon': -80.4650,
+        'status': 'Coming Soon', 'details': 'College campus with large parking area',
+        'hours': 'TBD - Campus hours', 'distance': '16-19 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    # Future Markets
+    {
+        'code': 'king_market', 'name': 'King Farmers Market', 'icon': '🌾', 'category': 'future_market',
+        'address': '105 Moore Road', 'city': 'King', 'state': 'NC',
+        'lat': 36.2789, 'lon': -80.3589,
+        'status': 'Future Expansion', 'details': 'Wednesdays market serving Stokes County',
+        'hours': 'Wednesdays 11:00 AM - 1:00 PM (April-October)', 'distance': '25-28 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    {
+        'code': 'elkin_market', 'name': 'Elkin Farmers Market', 'icon': '🌾', 'category': 'future_market',
+        'address': '226 North Bridge Street', 'city': 'Elkin', 'state': 'NC',
+        'lat': 36.2448, 'lon': -80.8509,
+        'status': 'Future Expansion', 'details': '45+ vendors with covered space and live music',
+        'hours': 'Saturdays 9:00 AM - 12:00 PM (April-TBD)', 'distance': '20-23 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    {
+        'code': 'pilot_mountain_market', 'name': 'Pilot Mountain Market', 'icon': '🌾', 'category': 'future_market',
+        'address': '300 South Key Street', 'city': 'Pilot Mountain', 'state': 'NC',
+        'lat': 36.3856, 'lon': -80.4700,
+        'status': 'Future Expansion', 'details': 'Saturday afternoon market',
+        'hours': 'Saturdays 3:00 PM - 6:00 PM (April-October)', 'distance': '15-18 miles from farm',
+        'offered': False, 'pickup_description': None, 'fee': 0.00
+    },
+    # Lockers (not on the map until their sites are surveyed)
+    {
+        'code': 'locker_downtown', 'name': 'Downtown Locker', 'icon': '🔐', 'category': None,
+        'address': 'Downtown Business District', 'city': 'Mount Airy', 'state': 'NC',
+        'lat': None, 'lon': None,
+        'status': 'Active', 'details': None, 'hours': '24/7', 'distance': None,
+        'offered': True, 'pickup_description': '24/7 access with code', 'fee': 0.50
+    },
+    {
+        'code': 'locker_shopping', 'name': 'Shopping Center Locker', 'icon': '🔐', 'category': None,
+        'address': 'Main Shopping Center', 'city': 'Mount Airy', 'state': 'NC',
+        'lat': None, 'lon': None,
+        'status': 'Active', 'details': None, 'hours': '24/7', 'distance': None,
+        'offered': True, 'pickup_description': '24/7 access with code', 'fee': 0.50
+    },
+)
+
+
+def load_pickup_locations(conn):
+    """Read active pickup locations from dim_locations in the same shape as DEFAULT_PICKUP_LOCATIONS"""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute("""
+            SELECT pickup_code AS code, location_name AS name, map_icon AS icon, map_category AS category,
+                   address_line1 AS address, city, state,
+                   latitude::float8 AS lat, longitude::float8 AS lon,
+                   status_label AS status, details, hours, distance_note AS distance,
+                   offered_for_pickup AS offered, pickup_description, delivery_fee::float8 AS fee
+            FROM dim_locations
+            WHERE is_active = TRUE AND pickup_code IS NOT NULL
+            ORDER BY sort_order, location_id
+        """)
+        return tuple(dict(row) for row in cur.fetchall())
+
+
+def pickup_options(locations):
+    """Order form pickup options keyed by pickup code, as used for orders.pickup_method"""
+    return {
+        location['code']: {
+            "name": location['name'],
+            "description": location['pickup_description'] or location['hours'],
+            "location": f"{location['address']}, {location['city']}",
+            "fee": location['fee'],
+        }
+        for location in locations
+        if location['offered']
+    }
+
+
+class PickupLocationIndex:
+    """Nearest-location lookups over every location with coordinates
+
+    Coordinates are kept as radians in numpy arrays, so a query is one
+    vectorized haversine over all locations plus a partial sort - a few
+    microseconds for hundreds of lockers and markets. numpy is imported on
+    first use so importing this module stays cheap.
+    """
+
+    def __init__(self, locations):
+        import numpy as np
+        self.locations = tuple(location for location in locations if location['lat'] is not None)
+        self._lat = np.radians([location['lat'] for location in self.locations])
+        self._lon = np.radians([location['lon'] for location in self.locations])
+        self._cos_lat = np.cos(self._lat)
+        self._offered = np.array([bool(location['offered']) for location in self.locations], dtype=bool)
+
+    def distances(self, lat, lon):
+        """Great-circle miles from (lat, lon) to every indexed location"""
+        import numpy as np
+        lat, lon = math.radians(lat), math.radians(lon)
+        a = (np.sin((self._lat - lat) / 2) ** 2
+             + math.cos(lat) * self._cos_lat * np.sin((self._lon - lon) / 2) ** 2)
+        return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+    def nearest(self, lat, lon, k=3, offered_only=False):
+        """Up to k (location, miles) pairs, closest first"""
+        import numpy as np
+        miles = self.distances(lat, lon)
+        if offered_only:
+            miles = np.where(self._offered, miles, np.inf)
+            k = min(k, int(self._offered.sum()))
+        k = min(k, len(miles))
+        if k == 0:
+            return []
+        closest = np.argpartition(miles, k - 1)[:k]
+        closest = closest[np.argsort(miles[closest])]
+        return [(self.locations[i], float(miles[i])) for i in closest]
@@ -1,13 +1,27 @@
 import streamlit as st
-import pandas as pd
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from datetime import datetime, timedelta, time
+import json
+import math
 import os
-import base64
+import select
+import threading
+import time as time_module
+from dataclasses import dataclass
 from typing import Optional
-import plotly.graph_objects as go
-import plotly.express as px
+
+# pandas and plotly are imported inside the few functions that use them, so
+# the home, subscription and contact pages never pay for them - see
+# benchmarks/cold_start.py
+from catalog import ProductCatalog, product_line_label
+from orders import OrderLine, OrderResult, generate_order_number, place_order
+from contact import save_contact_message
+from journal import JOURNAL_PATH, Journal, start_replayer
+from locations import DEFAULT_PICKUP_LOCATIONS, EARTH_RADIUS_MILES, PickupLocationIndex, load_pickup_locations, pickup_options
+from reports import REPORT_QUERIES, load_report, refresh_sales_reports, revenue_breakdown
 
 # Page configuration
 st.set_page_config(
@@ -135,145 +149,506 @@ div[data-testid="column"] .stImage {
 </style>
 """, unsafe_allow_html=True)
 
+def get_app_setting(section, key, default):
+    """Read an optional setting from st.secrets, falling back to the default"""
+    try:
+        return st.secrets.get(section, {}).get(key, default)
+    except Exception:
+        return default
+
 # Database configuration
+DB_POOL_MIN_CONNECTIONS = 1
+DB_POOL_MAX_CONNECTIONS = 10
+DB_POOL_CHECKOUT_TIMEOUT = 5  # seconds to wait for a free connection before giving up
+DB_HEALTH_CHECK_INTERVAL = 60  # seconds a connection may sit idle before it is pinged
+
+
+class HealthCheckedConnectionPool(ThreadedConnectionPool):
+    """Thread-safe connection pool that waits for a free slot and pings idle connections"""
+
+    def __init__(self, minconn, maxconn, checkout_timeout, health_check_interval, **kwargs):
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+        super().__init__(minconn, maxconn, **kwargs)
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        idle_for = time_module.monotonic() - self._last_used.get(id(conn), 0)
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolError("timed out waiting for a database connection")
+        try:
+            # Stale connections (server restarts, idle timeouts) are discarded and replaced
+            for _ in range(self.maxconn + 1):
+                conn = super().getconn(key)
+                if self._is_healthy(conn):
+                    return conn
+                self._last_used.pop(id(conn), None)
+                super().putconn(conn, key, close=True)
+            raise PoolError("no healthy database connections available")
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, key=None, close=False):
+        if not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                close = True
+        if close or conn.closed:
+            self._last_used.pop(id(conn), None)
+        else:
+            self._last_used[id(conn)] = time_module.monotonic()
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+@st.cache_resource
+def init_connection_pool():
+    """Create the Postgres connection pool shared by every session in this process"""
+    return HealthCheckedConnectionPool(
+        minconn=int(get_app_setting("db_pool", "min_connections", DB_POOL_MIN_CONNECTIONS)),
+        maxconn=int(get_app_setting("db_pool", "max_connections", DB_POOL_MAX_CONNECTIONS)),
+        checkout_timeout=float(get_app_setting("db_pool", "checkout_timeout", DB_POOL_CHECKOUT_TIMEOUT)),
+        health_check_interval=float(get_app_setting("db_pool", "health_check_interval", DB_HEALTH_CHECK_INTERVAL)),
+        **st.secrets.postgres
+    )
+
 def init_database_connection():
-    """Initialize database connection"""
+    """Check out a database connection from the shared pool"""
     try:
-        return psycopg2.connect(**st.secrets.postgres)
+        return init_connection_pool().getconn()
     except Exception as e:
         st.error("Database connection failed")
         return None
 
+def release_database_connection(conn):
+    """Return a checked-out connection to the shared pool"""
+    try:
+        init_connection_pool().putconn(conn)
+    except Exception:
+        conn.close()
+
 # Utility functions
-def get_current_inventory():
-    """Get current egg inventory"""
-    conn = init_database_connection()
-    if not conn:
-        return 0, datetime.now()
-    
+EGG_SKU = 'EGG-DOZ-001'
+EGG_LINE = 'eggs'  # dim_products subcategories with their own order tabs
+CHICK_LINE = 'chicks'
+STORE_MAX_QUANTITY = 20  # per product on the Farm Store order form
+ORDER_NUMBER_ATTEMPTS = 3  # fresh order numbers tried when one collides with an existing order
+INVENTORY_CACHE_TTL = 600  # seconds; a safety net, since stock changes are pushed via LISTEN/NOTIFY
+INVENTORY_CHANGE_CHANNEL = 'inventory_changed'
+INVENTORY_LISTENER_POLL_TIMEOUT = 60  # seconds between wakeups while waiting for notifications
+INVENTORY_LISTENER_MAX_RETRY_DELAY = 60  # seconds between reconnect attempts at most
+REPORTS_CACHE_TTL = 300  # seconds; the stored reports only change when the refresh job runs
+PICKUP_LOCATIONS_CACHE_TTL = 3600  # seconds; locations change a few times a season
+SIDEBAR_INVENTORY_REFRESH_INTERVAL = 30  # seconds between sidebar availability redraws
+
+
+@dataclass(frozen=True)
+class InventorySnapshot:
+    """Egg stock, chick totals and every active product row, read together in one query"""
+    egg_stock: int
+    egg_last_updated: datetime
+    chick_stock: int
+    chick_last_updated: datetime
+    products: tuple = ()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a snapshot from the egg SKU row and the active product rows"""
+        now = datetime.now()
+        egg_row = next((row for row in rows if row['sku'] == EGG_SKU), None)
+        chick_rows = [row for row in rows if row['subcategory'] == CHICK_LINE and row['is_active']]
+        chick_updates = [row['updated_date'] for row in chick_rows if row['updated_date']]
+        return cls(
+            egg_stock=egg_row['current_stock'] if egg_row else 0,
+            egg_last_updated=egg_row['updated_date'] if egg_row else now,
+            chick_stock=sum(row['current_stock'] or 0 for row in chick_rows),
+            chick_last_updated=max(chick_updates) if chick_updates else now,
+            products=tuple(
+                {key: value for key, value in row.items() if key not in ('category_id', 'is_active')}
+                for row in rows if row['is_active']
+            )
+        )
+
+
+@st.cache_data(ttl=get_app_setting("cache", "inventory_ttl_seconds", INVENTORY_CACHE_TTL), show_spinner=False)
+def fetch_inventory_rows():
+    """Fetch the egg row and every active product with its product line, shared across sessions until the TTL expires
+
+    One query for the whole catalog: stock and price come from products, the
+    product line and descriptive columns from dim_products (joined on sku).
+    Rows without a dim_products match fall back to their legacy category_id.
+    """
+    conn = init_connection_pool().getconn()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("""
-                SELECT current_stock, updated_date 
-                FROM products 
-                WHERE sku = 'EGG-DOZ-001'
-            """)
-            result = cur.fetchone()
-            if result:
-                return result['current_stock'], result['updated_date']
-            return 0, datetime.now()
+                SELECT p.id, p.sku, p.name, COALESCE(d.description, p.description) AS description,
+                       COALESCE(d.category, 'animal') AS category,
+                       COALESCE(d.subcategory, CASE p.category_id WHEN 1 THEN %(egg_line)s
+                                                                  WHEN 2 THEN %(chick_line)s END, 'other') AS subcategory,
+                       d.breed, d.product_type, d.size,
+                       p.category_id, p.is_active AND COALESCE(d.is_active, true) AS is_active,
+                       p.current_stock, p.price, p.updated_date
+                FROM products p
+                LEFT JOIN dim_products d ON d.sku = p.sku
+                WHERE p.sku = %(egg_sku)s OR (p.is_active = true AND COALESCE(d.is_active, true))
+                ORDER BY d.product_id NULLS LAST, p.name
+            """, {'egg_sku': EGG_SKU, 'egg_line': EGG_LINE, 'chick_line': CHICK_LINE})
+            return [dict(row) for row in cur.fetchall()]
+    finally:
+        release_database_connection(conn)
+
+
+# Streamlit re-executes this script on every rerun, so this module-level memo only
+# lives for a single script run and every widget in that run reads the same numbers.
+_inventory_snapshot = None
+
+def get_inventory_snapshot():
+    """Get the inventory snapshot for this script run, loading it on first use"""
+    global _inventory_snapshot
+    if _inventory_snapshot is None:
+        _inventory_snapshot = load_inventory_snapshot()
+    return _inventory_snapshot
+
+@st.cache_resource
+def last_known_inventory():
+    """The most recent inventory rows read successfully, for when the database is unreachable"""
+    return {}
+
+def load_inventory_snapshot():
+    """Build an inventory snapshot from the shared inventory cache"""
+    last_known = last_known_inventory()
+    try:
+        rows = fetch_inventory_rows()
+        last_known.update(rows=rows, read_at=datetime.now())
+        return InventorySnapshot.from_rows(rows)
     except Exception as e:
+        if last_known:
+            # Keep selling from the last stock we saw; orders are journaled and confirmed once we're back online
+            st.warning(f"📡 We're having trouble reaching our inventory - showing availability as of "
+                       f"{last_known['read_at']:%I:%M %p}. Orders will be confirmed as soon as we're back online.")
+            return InventorySnapshot.from_rows(last_known['rows'])
         st.error(f"Error fetching inventory: {e}")
-        return 0, datetime.now()
-    finally:
-        conn.close()
+        return InventorySnapshot(0, datetime.now(), 0, datetime.now())
+
+def invalidate_inventory_cache():
+    """Drop cached inventory so the next read sees the latest stock; call after every stock write"""
+    global _inventory_snapshot
+    fetch_inventory_rows.clear()
+    _inventory_snapshot = None
+
+@st.cache_resource
+def start_inventory_listener():
+    """Start the background thread that refreshes cached inventory on Postgres NOTIFY"""
+    listener = threading.Thread(target=listen_for_inventory_changes, name="inventory-listener", daemon=True)
+    listener.start()
+    return listener
+
+def listen_for_inventory_changes():
+    """LISTEN for stock changes and refresh the shared inventory cache when one arrives"""
+    retry_delay = 1
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(**st.secrets.postgres)
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {INVENTORY_CHANGE_CHANNEL}")
+            # Changes made while we were disconnected never reached us
+            refresh_inventory_cache()
+            retry_delay = 1
+            while True:
+                if select.select([conn], [], [], INVENTORY_LISTENER_POLL_TIMEOUT) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    refresh_inventory_cache()
+        except Exception:
+            time_module.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, INVENTORY_LISTENER_MAX_RETRY_DELAY)
+        finally:
+            if conn is not None:
+                conn.close()
+
+def refresh_inventory_cache():
+    """Replace the cached inventory rows with a fresh read from the database"""
+    fetch_inventory_rows.clear()
+    try:
+        fetch_inventory_rows()
+    except Exception:
+        pass  # The next reader will retry and surface the error
+
+def get_current_inventory():
+    """Get current egg inventory"""
+    snapshot = get_inventory_snapshot()
+    return snapshot.egg_stock, snapshot.egg_last_updated
         
 def get_chick_inventory():
     """Get current chick inventory from database"""
-    conn = init_database_connection()
-    if not conn:
-        return 0, datetime.now()
-    
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            # Sum up all chick products (category_id = 2)
-            cur.execute("""
-                SELECT SUM(current_stock) as total_stock, MAX(updated_date) as last_updated
-                FROM products 
-                WHERE category_id = 2 AND is_active = true
-            """)
-            result = cur.fetchone()
-            if result and result['total_stock']:
-                return result['total_stock'], result['last_updated'] or datetime.now()
-            return 0, datetime.now()
-    except Exception as e:
-        st.error(f"Error fetching chick inventory: {e}")
-        return 0, datetime.now()
-    finally:
-        conn.close()
+    snapshot = get_inventory_snapshot()
+    return snapshot.chick_stock, snapshot.chick_last_updated
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_product_catalog(products):
+    """Product catalog, built once per version of the inventory and shared across sessions"""
+    return ProductCatalog(products)
+
+def get_product_catalog():
+    """Product catalog for this run's inventory snapshot"""
+    return build_product_catalog(get_inventory_snapshot().products)
+
+def update_inventory(new_stock, notes="Manual update", sku=EGG_SKU):
+    """Set a product's stock level and log the adjustment in one atomic statement
 
-def update_inventory(new_stock, notes="Manual update"):
-    """Update egg inventory"""
+    Returns (previous_stock, new_stock) on success, or None if the update failed.
+    """
     conn = init_database_connection()
     if not conn:
-        return False
+        return None
     
     try:
         with conn.cursor() as cur:
-            # Get current stock for transaction log
-            cur.execute("SELECT current_stock FROM products WHERE sku = 'EGG-DOZ-001'")
-            old_stock = cur.fetchone()[0]
-            
-            # Update inventory
+            # FOR UPDATE locks the row before previous_stock is read, so concurrent
+            # admin edits serialize instead of logging a stale previous_stock
             cur.execute("""
-                UPDATE products 
-                SET current_stock = %s, updated_date = %s 
-                WHERE sku = 'EGG-DOZ-001'
-            """, (new_stock, datetime.now()))
-            
-            # Log transaction
-            cur.execute("""
-                INSERT INTO inventory_transactions 
-                (product_id, transaction_type, quantity_change, previous_stock, new_stock, notes)
-                VALUES ((SELECT id FROM products WHERE sku = 'EGG-DOZ-001'), 
-                        'adjustment', %s, %s, %s, %s)
-            """, (new_stock - old_stock, old_stock, new_stock, notes))
+                WITH current AS (
+                    SELECT id, current_stock
+                    FROM products
+                    WHERE sku = %(sku)s
+                    FOR UPDATE
+                ), updated AS (
+                    UPDATE products p
+                    SET current_stock = %(new_stock)s, updated_date = %(updated_date)s
+                    FROM current
+                    WHERE p.id = current.id
+                    RETURNING p.id, current.current_stock AS previous_stock, p.current_stock AS new_stock
+                ), logged AS (
+                    INSERT INTO inventory_transactions 
+                    (product_id, transaction_type, quantity_change, previous_stock, new_stock, notes)
+                    SELECT id, 'adjustment', new_stock - previous_stock, previous_stock, new_stock, %(notes)s
+                    FROM updated
+                )
+                SELECT previous_stock, new_stock FROM updated
+            """, {'sku': sku, 'new_stock': new_stock, 'updated_date': datetime.now(), 'notes': notes})
+            result = cur.fetchone()
+            if result is None:
+                conn.rollback()
+                st.error(f"Error updating inventory: unknown SKU {sku}")
+                return None
             
             conn.commit()
-            return True
+            invalidate_inventory_cache()
+            return result
     except Exception as e:
         conn.rollback()
         st.error(f"Error updating inventory: {e}")
-        return False
+        return None
     finally:
-        conn.close()
+        release_database_connection(conn)
+
+@st.cache_resource
+def get_offline_journal():
+    """Local journal for orders and messages made while the database is unreachable"""
+    return Journal(get_app_setting("journal", "path", JOURNAL_PATH))
+
+@st.cache_resource
+def start_journal_replayer():
+    """Start the background thread that replays journaled writes once the database is back"""
+    return start_replayer(get_offline_journal(), lambda: psycopg2.connect(**st.secrets.postgres))
+
+def submit_order(customer_name, customer_email, customer_phone, lines, pickup_choice, payment_method, notes):
+    """Persist an order from one of the order forms, reserving its stock
+
+    Returns an OrderResult (confirmed, sold out, or queued in the offline journal
+    when the database can't be reached), or None if the order could not be saved.
+    """
+    # Numbered up front so a journaled order keeps the number the customer was given,
+    # and replaying one that did reach the database before the connection dropped is a no-op
+    order = dict(
+        customer_name=customer_name,
+        customer_email=customer_email,
+        customer_phone=customer_phone,
+        pickup_method=pickup_choice,
+        pickup_fee=get_pickup_options()[pickup_choice]['fee'],
+        payment_method=payment_method,
+        notes=notes,
+        order_number=generate_order_number()
+    )
+    try:
+        conn = init_connection_pool().getconn()
+    except (psycopg2.OperationalError, PoolError):
+        return journal_order(order, lines)
+    
+    try:
+        for _ in range(ORDER_NUMBER_ATTEMPTS):
+            result = place_order(conn, lines=lines, **order)
+            if result.status != 'duplicate':
+                break
+            # The number was generated just now, so it collided with another customer's order
+            order['order_number'] = generate_order_number()
+        else:
+            st.error("Error placing order: couldn't assign an order number")
+            return None
+        invalidate_inventory_cache()
+        return result
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return journal_order(order, lines)
+    except Exception as e:
+        st.error(f"Error placing order: {e}")
+        return None
+    finally:
+        release_database_connection(conn)
+
+def journal_order(order, lines):
+    """Save an order to the offline journal; its stock is reserved when it is replayed"""
+    try:
+        get_offline_journal().append('order', dict(order, lines=[
+            {'sku': line.sku, 'quantity': line.quantity, 'unit_price': line.unit_price} for line in lines
+        ]), entry_key=order['order_number'])
+    except Exception as e:
+        st.error(f"Error placing order: {e}")
+        return None
+    st.info("📡 Our farm internet is down right now, so we've saved your order on our side. "
+            "It will be confirmed as soon as we're back online - keep your order number handy.")
+    return OrderResult('queued', order_number=order['order_number'])
+
+@st.cache_data(ttl=PICKUP_LOCATIONS_CACHE_TTL, show_spinner=False)
+def fetch_pickup_locations():
+    """Read active pickup locations from dim_locations, shared across sessions until the TTL expires"""
+    conn = init_connection_pool().getconn()
+    try:
+        return load_pickup_locations(conn)
+    finally:
+        release_database_connection(conn)
+
+def get_pickup_locations():
+    """Get pickup locations, falling back to the built-in list if the database can't be read"""
+    try:
+        return fetch_pickup_locations() or DEFAULT_PICKUP_LOCATIONS
+    except Exception:
+        return DEFAULT_PICKUP_LOCATIONS
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_pickup_location_index(locations):
+    """Nearest-pickup index, built once per version of the location data"""
+    return PickupLocationIndex(locations)
 
 def get_pickup_options():
     """Get available pickup options"""
-    return {
-        "farmers_market": {
-            "name": "Farmers Market",
-            "description": "Saturday 3:00 PM - 6:00 PM",
-            "location": "Local Farmers Market",
-            "fee": 0.00
-        },
-        "farm_pickup": {
-            "name": "Farm Pickup",
-            "description": "By appointment (24hr notice)",
-            "location": "LMW Farm",
-            "fee": 0.00
-        },
-        "locker_downtown": {
-            "name": "Downtown Locker",
-            "description": "24/7 access with code",
-            "location": "Downtown Business District",
-            "fee": 0.50
-        },
-        "locker_shopping": {
-            "name": "Shopping Center Locker",
-            "description": "24/7 access with code",
-            "location": "Main Shopping Center",
-            "fee": 0.50
-        }
-    }
+    return pickup_options(get_pickup_locations())
+
+# Image assets (the shared store built by build_assets.py)
+ASSET_DIR = os.path.join("static", "assets")
+STREAMLIT_ASSET_URL_PREFIX = "app/static/assets"
+# Point [assets] base_url at api.py's /assets route to serve the store with immutable cache headers,
+# from the same URLs the React site uses
+ASSET_URL_PREFIX = get_app_setting("assets", "base_url", STREAMLIT_ASSET_URL_PREFIX).rstrip("/")
+FULL_WIDTH_IMAGE_SIZES = "(max-width: 640px) 100vw, 730px"
+
+@st.cache_resource(show_spinner=False)
+def load_asset_manifest():
+    """Read the asset manifest once per process; empty if the store hasn't been built"""
+    try:
+        with open(os.path.join(ASSET_DIR, "manifest.json")) as f:
+            manifest = json.load(f)
+        return {path: manifest["objects"][digest] for path, digest in manifest["paths"].items()}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def asset_entry(path):
+    """Manifest entry for a source image path such as pictures/eggs.jpeg"""
+    return load_asset_manifest().get(os.path.normpath(path).replace(os.sep, "/"))
+
+def asset_path(path):
+    """Largest pre-sized JPEG/PNG variant of a picture, or the original if there is none"""
+    entry = asset_entry(path)
+    if not entry:
+        return path
+    fallback = [variant for variant in entry["variants"] if variant["format"] != "webp"]
+    return os.path.join(ASSET_DIR, fallback[-1]["file"])
+
+@st.cache_resource(show_spinner=False)
+def asset_picture_html(path, caption=None, sizes=FULL_WIDTH_IMAGE_SIZES, style="width: 100%; height: auto;"):
+    """<picture> markup that lets the browser pick a WebP or JPEG/PNG variant, or None if not built"""
+    entry = asset_entry(path)
+    if not entry:
+        return None
+    if ASSET_URL_PREFIX == STREAMLIT_ASSET_URL_PREFIX and not st.get_option("server.enableStaticServing"):
+        return None
+    
+    srcsets = {}
+    for variant in entry["variants"]:
+        srcsets.setdefault(variant["format"], []).append(
+            f"{ASSET_URL_PREFIX}/{variant['file']} {variant['width']}w"
+        )
+    fallback_format = next(image_format for image_format in srcsets if image_format != "webp")
+    fallback = [variant for variant in entry["variants"] if variant["format"] == fallback_format][0]
+    caption_html = (
+        f'<figcaption style="color: rgba(49, 51, 63, 0.6); font-size: 14px; margin-top: 4px;">{caption}</figcaption>'
+        if caption else ""
+    )
+    return (
+        '<figure style="margin: 0 0 1rem 0; text-align: center;"><picture>'
+        f'<source type="image/webp" srcset="{", ".join(srcsets["webp"])}" sizes="{sizes}">'
+        f'<img src="{ASSET_URL_PREFIX}/{fallback["file"]}" srcset="{", ".join(srcsets[fallback_format])}" '
+        f'sizes="{sizes}" width="{fallback["width"]}" height="{fallback["height"]}" loading="lazy" '
+        f'alt="{caption or ""}" style="{style}">'
+        f'</picture>{caption_html}</figure>'
+    )
+
+def show_image(path, caption=None, sizes=FULL_WIDTH_IMAGE_SIZES, style="width: 100%; height: auto;"):
+    """Show a picture from pictures/ using its pre-built variants when available"""
+    html = asset_picture_html(path, caption, sizes, style)
+    if html:
+        st.markdown(html, unsafe_allow_html=True)
+    else:
+        st.image(asset_path(path), caption=caption, use_container_width=True)
 
 # Main app navigation
+PAGES = [
+    "🏠 Home & Our Story",
+    "🥚 Order Fresh Eggs", 
+    "📦 Subscription Service",
+    "🐔 Our Chickens & Breeds",
+    "📍 Pickup Locations",
+    "📞 Contact Us",
+    "🔐 Admin Panel"
+]
+# ?page=<slug> opens the app on that page; the static site (export_static.py) links in this way
+PAGE_SLUGS = dict(zip(["home", "order", "subscription", "chickens", "pickup", "contact", "admin"], PAGES))
+
 def main():
     # Sidebar navigation
     st.sidebar.markdown("# 🥚 LMW Farm ")
     st.sidebar.markdown("*Fresh. Local. Family.*")
     
-    page = st.sidebar.selectbox("Navigate", [
-        "🏠 Home & Our Story",
-        "🥚 Order Fresh Eggs", 
-        "📦 Subscription Service",
-        "🐔 Our Chickens & Breeds",
-        "📍 Pickup Locations",
-        "📞 Contact Us",
-        "🔐 Admin Panel"
-    ])
+    requested_page = PAGE_SLUGS.get(st.query_params.get("page"), PAGES[0])
+    page = st.sidebar.selectbox("Navigate", PAGES, index=PAGES.index(requested_page))
     
-    update_sidebar_inventory()
+    start_inventory_listener()
+    start_journal_replayer()
+    # Fragments can't write to st.sidebar themselves, so render this one inside it
+    with st.sidebar:
+        update_sidebar_inventory()
     
     # Page routing
     if page == "🏠 Home & Our Story":
@@ -311,7 +686,7 @@ def show_home_page():
         
         # Farm logo - bigger and centered
         try:
-            st.image("pictures/Updatedlogo.png", use_container_width=True)
+            show_image("pictures/Updatedlogo.png")
         except:
             st.markdown("🥚🐔")  # Fallback if image not found
         
@@ -383,7 +758,8 @@ def show_home_page():
     
     with col1:
         try:
-            st.image("pictures/LMWFam.JPG", caption="The LMW Farm Family", use_container_width=True)
+            show_image("pictures/LMWFam.JPG", caption="The LMW Farm Family",
+                       sizes="(max-width: 640px) 100vw, 420px")
         except:
             st.info("📸 Family photo coming soon!")
     
@@ -541,17 +917,19 @@ def show_home_page():
     )
 
 def show_order_page():
-    """Order page for purchasing eggs and chicks"""
+    """Order page for eggs, chicks and every other product line in the catalog"""
     st.markdown(
     '<div style="text-align: center; font-size: 4.2em; color: #2e7d32; font-family: Georgia, serif; font-weight: bold; text-shadow: 3px 3px 6px rgba(0,0,0,0.3); margin-bottom: 20px;">🥚🐣 Order Fresh Farm Products</div>',
     unsafe_allow_html=True)
     
-    # Get inventory for both products
-    egg_stock, egg_last_updated = get_current_inventory()  # Your existing function
-    chick_stock, chick_last_updated = get_chick_inventory()  # New function
+    # The whole catalog comes from this run's single inventory query
+    catalog = get_product_catalog()
+    egg_product = catalog.by_sku.get(EGG_SKU)
+    eggs_available = egg_product is not None and egg_product.orderable
+    chicks_available = bool(catalog.orderable_in(CHICK_LINE))
     
     # Check if completely sold out
-    if egg_stock <= 0 and chick_stock <= 0:
+    if not catalog.orderable_lines:
         st.markdown('<div class="warning-box">', unsafe_allow_html=True)
         st.markdown("### Sorry, we're currently sold out of all products!")
         st.markdown("Check back soon for fresh eggs and chicks, or consider signing up for our subscription service.")
@@ -561,57 +939,65 @@ def show_order_page():
     # Product selection
     st.markdown("## What would you like to order?")
 
-# Show inventory status above tabs
-    col1, col2 = st.columns(2)
-    with col1:
-     st.markdown(f"""
-    <div style="background: white; padding: 20px; border-radius: 10px; 
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 15px 0; 
-                border: 2px solid #e8f5e8; text-align: center;">
-        <h3 style="color: #2e7d32; margin: 0;">🥚 Eggs Available</h3>
-        <p style="font-size: 1.5em; font-weight: bold; color: #000; margin: 10px 0;">{egg_stock} dozen</p>
-        <p style="color: #555; margin: 0;">$6.00 per dozen</p>
-    </div>
-    """, unsafe_allow_html=True)
+    # Show availability for every product line in stock above the tabs, three to a row
+    lines = catalog.orderable_lines
+    for row_start in range(0, len(lines), 3):
+        for column, line in zip(st.columns(3), lines[row_start:row_start + 3]):
+            with column:
+                st.markdown(product_line_card_html(catalog, line), unsafe_allow_html=True)
 
-    with col2:
-     st.markdown(f"""
+    if not eggs_available:
+        st.info("🥚 Eggs are currently sold out - check the Farm Store for everything else")
+    elif not chicks_available:
+        st.info("🐣 Chicks are currently sold out - check the Farm Store for everything else")
+    
+    # Eggs and chicks keep their own forms; the Farm Store covers every line, including those two
+    tab_labels = []
+    if eggs_available:
+        tab_labels.append(product_line_label(EGG_LINE))
+    if chicks_available:
+        tab_labels.append(product_line_label(CHICK_LINE))
+    tab_labels.append("🛒 Farm Store")
+    product_tabs = dict(zip(tab_labels, st.tabs(tab_labels)))
+    
+    if eggs_available:
+        with product_tabs[product_line_label(EGG_LINE)]:
+            show_egg_ordering(egg_product)
+    
+    if chicks_available:
+        with product_tabs[product_line_label(CHICK_LINE)]:
+            show_chick_ordering(catalog)
+    
+    with product_tabs["🛒 Farm Store"]:
+        show_store_ordering(catalog)
+
+
+def product_line_card_html(catalog, line):
+    """Availability card for one product line on the order page"""
+    price_low, price_high = catalog.price_range(line)
+    stock = sum(product.current_stock for product in catalog.orderable_in(line))
+    stock_text, unit = (f"{stock} dozen", "per dozen") if line == EGG_LINE else (f"{stock} available", "each")
+    if price_low == price_high:
+        price_text = f"${price_low:.2f} {unit}"
+    else:
+        price_text = f"${price_low:.2f}-${price_high:.2f} {unit}"
+    border, heading = ("#fff3e0", "#e65100") if line == CHICK_LINE else ("#e8f5e8", "#2e7d32")
+    return f"""
     <div style="background: white; padding: 20px; border-radius: 10px; 
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: 15px 0; 
-                border: 2px solid #fff3e0; text-align: center;">
-        <h3 style="color: #e65100; margin: 0;">🐣 Chicks Available</h3>
-        <p style="font-size: 1.5em; font-weight: bold; color: #000; margin: 10px 0;">{chick_stock} total</p>
-        <p style="color: #555; margin: 0;">Multiple breeds - $5.00-$8.00 each</p>
+                border: 2px solid {border}; text-align: center;">
+        <h3 style="color: {heading}; margin: 0;">{product_line_label(line)}</h3>
+        <p style="font-size: 1.5em; font-weight: bold; color: #000; margin: 10px 0;">{stock_text}</p>
+        <p style="color: #555; margin: 0;">{price_text}</p>
     </div>
-    """, unsafe_allow_html=True)
-
-    
-    # Create tabs for different products
-    if egg_stock > 0 and chick_stock > 0:
-        product_tabs = st.tabs(["🥚 Fresh Eggs", "🐣 Baby Chicks", "🛒 Mixed Order"])
-        
-        with product_tabs[0]:
-            show_egg_ordering(egg_stock, egg_last_updated)
-            
-        with product_tabs[1]:
-            show_chick_ordering(chick_stock, chick_last_updated)
-            
-        with product_tabs[2]:
-            show_mixed_ordering(egg_stock, chick_stock, egg_last_updated, chick_last_updated)
-            
-    elif egg_stock > 0:
-        st.info("🐣 Chicks are currently sold out - only eggs available")
-        show_egg_ordering(egg_stock, egg_last_updated)
-        
-    elif chick_stock > 0:
-        st.info("🥚 Eggs are currently sold out - only chicks available")
-        show_chick_ordering(chick_stock, chick_last_updated)
+    """
 
 
 # 3. ADD THESE NEW FUNCTIONS at the end of your script, before the main() call:
 
-def show_egg_ordering(current_stock, last_updated):
+def show_egg_ordering(egg_product):
     """Display egg ordering section - uses your existing form logic"""
+    current_stock, price = egg_product.current_stock, float(egg_product.price)
     
     
     # Order form - this is basically your existing order form
@@ -627,7 +1013,7 @@ def show_egg_ordering(current_stock, last_updated):
             quantity = st.selectbox(
                 "How many dozen eggs?*",
                 options=list(range(1, min(current_stock + 1, 11))),
-                format_func=lambda x: f"{x} dozen (${x * 6.00:.2f})"
+                format_func=lambda x: f"{x} dozen (${x * price:.2f})"
             )
             
             pickup_options = get_pickup_options()
@@ -648,7 +1034,7 @@ def show_egg_ordering(current_stock, last_updated):
         )
         
         # Order summary
-        total_cost = quantity * 6.00 + pickup_options[pickup_choice]['fee']
+        total_cost = quantity * price + pickup_options[pickup_choice]['fee']
         st.markdown(f"**Order Total: ${total_cost:.2f}**")
         
         submitted = st.form_submit_button("🛒 Place Egg Order", type="primary", use_container_width=True)
@@ -656,12 +1042,24 @@ def show_egg_ordering(current_stock, last_updated):
         if submitted:
             if not all([customer_name, customer_email, customer_phone]):
                 st.error("Please fill in all required fields (marked with *)")
+                return
+            
+            result = submit_order(
+                customer_name, customer_email, customer_phone,
+                [OrderLine(EGG_SKU, quantity, egg_product.price)],
+                pickup_choice, payment_method, special_notes
+            )
+            if result is None:
+                st.error("❌ We couldn't place your order. Please try again or contact us directly.")
+            elif not (result.confirmed or result.queued):
+                st.warning("😢 Sorry, those eggs just sold out! Please pick a smaller quantity or check back tomorrow.")
             else:
                 # Order confirmation
                 st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                st.markdown("### ✅ Egg Order Confirmed!")
+                st.markdown(f"### ✅ Egg Order {'Confirmed' if result.confirmed else 'Received'}!")
                 st.markdown(f"""
                 **Order Details:**
+                - Order Number: {result.order_number}
                 - Customer: {customer_name}
                 - Product: {quantity} dozen eggs
                 - Total: ${total_cost:.2f}
@@ -674,50 +1072,27 @@ def show_egg_ordering(current_stock, last_updated):
                 st.markdown('</div>', unsafe_allow_html=True)
 
 
-def get_available_chick_breeds():
-    """Get all available chick breeds with their details"""
-    conn = init_database_connection()
-    if not conn:
-        return []
-    
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                SELECT id, name, description, sku, current_stock, price
-                FROM products 
-                WHERE category_id = 2 AND is_active = true AND current_stock > 0
-                ORDER BY name
-            """)
-            results = cur.fetchall()
-            return [dict(result) for result in results]
-    except Exception as e:
-        st.error(f"Error fetching chick breeds: {e}")
-        return []
-    finally:
-        conn.close()
-
-
-def show_chick_ordering(current_stock, last_updated):
+def show_chick_ordering(catalog):
     """Display chick ordering section with breed selection"""
 
     
     # Get available breeds
-    available_breeds = get_available_chick_breeds()
+    chicks = {product.sku: product for product in catalog.orderable_in(CHICK_LINE)}
     
-    if not available_breeds:
+    if not chicks:
         st.warning("No chick breeds currently available.")
         return
     
     # Display available breeds
     st.markdown("### Available Breeds:")
-    for breed in available_breeds:
+    for breed in chicks.values():
         col1, col2, col3 = st.columns([2, 1, 1])
         with col1:
-            st.markdown(f"**{breed['name']}** - {breed['description']}")
+            st.markdown(f"**{breed.name}** - {breed.description}")
         with col2:
-            st.markdown(f"${breed['price']:.2f} each")
+            st.markdown(f"${breed.price:.2f} each")
         with col3:
-            st.markdown(f"{breed['current_stock']} available")
+            st.markdown(f"{breed.current_stock} available")
     
     
     # Order form
@@ -731,20 +1106,17 @@ def show_chick_ordering(current_stock, last_updated):
         
         with col2:
             # Breed selection
-            breed_options = {breed['sku']: f"{breed['name']} - ${breed['price']:.2f}" for breed in available_breeds}
             selected_breed_sku = st.selectbox(
                 "Select Breed*",
-                options=list(breed_options.keys()),
-                format_func=lambda x: breed_options[x]
+                options=list(chicks),
+                format_func=lambda sku: chicks[sku].label
             )
-            
-            # Find selected breed details
-            selected_breed = next(breed for breed in available_breeds if breed['sku'] == selected_breed_sku)
+            selected_breed = chicks[selected_breed_sku]
             
             quantity = st.selectbox(
                 "How many chicks?*",
-                options=list(range(1, min(selected_breed['current_stock'] + 1, 21))),
-                format_func=lambda x: f"{x} chicks (${x * float(selected_breed['price']):.2f})"
+                options=list(range(1, min(selected_breed.current_stock + 1, 21))),
+                format_func=lambda x: f"{x} chicks (${x * float(selected_breed.price):.2f})"
             )
             
             pickup_options = get_pickup_options()
@@ -768,7 +1140,7 @@ def show_chick_ordering(current_stock, last_updated):
         st.markdown("**⚠️ Important:** Chicks need heat, food, and water immediately upon pickup. Please ensure you have proper brooder setup ready.")
         
         # Order summary
-        total_cost = quantity * float(selected_breed['price']) + pickup_options[pickup_choice]['fee']
+        total_cost = quantity * float(selected_breed.price) + pickup_options[pickup_choice]['fee']
         st.markdown(f"**Order Total: ${total_cost:.2f}**")
         
         submitted = st.form_submit_button("🛒 Place Chick Order", type="primary", use_container_width=True)
@@ -776,14 +1148,26 @@ def show_chick_ordering(current_stock, last_updated):
         if submitted:
             if not all([customer_name, customer_email, customer_phone]):
                 st.error("Please fill in all required fields (marked with *)")
+                return
+            
+            result = submit_order(
+                customer_name, customer_email, customer_phone,
+                [OrderLine(selected_breed.sku, quantity, selected_breed.price)],
+                pickup_choice, payment_method, special_notes
+            )
+            if result is None:
+                st.error("❌ We couldn't place your order. Please try again or contact us directly.")
+            elif not (result.confirmed or result.queued):
+                st.warning(f"😢 Sorry, {selected_breed.name} chicks just sold out! Please pick a smaller quantity or another breed.")
             else:
                 # Order confirmation
                 st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                st.markdown("### ✅ Chick Order Confirmed!")
+                st.markdown(f"### ✅ Chick Order {'Confirmed' if result.confirmed else 'Received'}!")
                 st.markdown(f"""
                 **Order Details:**
+                - Order Number: {result.order_number}
                 - Customer: {customer_name}
-                - Product: {quantity} {selected_breed['name']}
+                - Product: {quantity} {selected_breed.name}
                 - Total: ${total_cost:.2f}
                 - Pickup: {pickup_options[pickup_choice]['name']}
                 - Payment: {payment_method}
@@ -796,16 +1180,14 @@ def show_chick_ordering(current_stock, last_updated):
                 st.markdown('</div>', unsafe_allow_html=True)
 
 
-def show_mixed_ordering(egg_stock, chick_stock, egg_last_updated, chick_last_updated):
-    """Display mixed product ordering section"""
-    st.markdown("### Order both eggs and chicks together")
-    
+def show_store_ordering(catalog):
+    """Display the Farm Store: one order form with a section for every product line in the catalog"""
+    st.markdown("### Order anything from the farm together")
     
-    # Get available breeds for mixed order
-    available_breeds = get_available_chick_breeds()
+    # Form widgets must be created inside the form; quantities are keyed by SKU
+    quantities = {}
     
-    # Mixed order form
-    with st.form("mixed_order_form"):
+    with st.form("store_order_form"):
         st.markdown("#### Customer Information")
         col1, col2 = st.columns(2)
         
@@ -828,87 +1210,74 @@ def show_mixed_ordering(egg_stock, chick_stock, egg_last_updated, chick_last_upd
             )
         
         st.markdown("#### Product Selection")
-        col3, col4 = st.columns(2)
-        
-        with col3:
-            st.markdown("**🥚 Eggs**")
-            egg_quantity = st.selectbox(
-                "Dozen eggs",
-                options=list(range(0, min(egg_stock + 1, 11))),
-                format_func=lambda x: f"{x} dozen" if x > 0 else "None"
-            )
-        
-        with col4:
-            st.markdown("**🐣 Chicks**")
-            if available_breeds:
-                chick_breed_sku = st.selectbox(
-                    "Chick breed (optional)",
-                    options=["none"] + [breed['sku'] for breed in available_breeds],
-                    format_func=lambda x: "No chicks" if x == "none" else next(breed['name'] for breed in available_breeds if breed['sku'] == x)
-                )
-                
-                if chick_breed_sku != "none":
-                    selected_chick_breed = next(breed for breed in available_breeds if breed['sku'] == chick_breed_sku)
-                    chick_quantity = st.selectbox(
-                        f"How many {selected_chick_breed['name']}?",
-                        options=list(range(1, min(selected_chick_breed['current_stock'] + 1, 21))),
-                        format_func=lambda x: f"{x} chicks (${x * float(selected_chick_breed['price']):.2f})"
+        for line, products in catalog.lines.items():
+            orderable = [product for product in products if product.orderable]
+            inquiry_only = [product for product in products if product.inquiry_only]
+            if not orderable and not inquiry_only:
+                continue
+            
+            with st.expander(product_line_label(line), expanded=line == EGG_LINE):
+                for product in orderable:
+                    quantities[product.sku] = st.number_input(
+                        f"{product.label} ({product.current_stock} available)",
+                        min_value=0,
+                        max_value=min(product.current_stock, STORE_MAX_QUANTITY),
+                        step=1,
+                        help=product.description,
+                        key=f"store_quantity_{product.sku}"
                     )
-                else:
-                    chick_quantity = 0
-                    selected_chick_breed = None
-            else:
-                st.info("No chick breeds currently available")
-                chick_quantity = 0
-                selected_chick_breed = None
+                for product in inquiry_only:
+                    st.markdown(f"**{product.name}** - {product.description}")
         
         special_notes = st.text_area(
             "Special Instructions (optional)",
             placeholder="Any special requests, breed preferences, delivery instructions, or notes..."
         )
         
-        # Order validation and summary
-        if egg_quantity == 0 and chick_quantity == 0:
-            st.error("Please select at least one product to order.")
-        else:
-            # Calculate costs
-            egg_cost = egg_quantity * 6.00
-            chick_cost = chick_quantity * float(selected_chick_breed['price']) if selected_chick_breed else 0
-            pickup_fee = pickup_options[pickup_choice]['fee']
-            total_cost = egg_cost + chick_cost + pickup_fee
-            
-            st.markdown("#### Order Summary")
-            if egg_quantity > 0:
-                st.markdown(f"- {egg_quantity} dozen eggs: ${egg_cost:.2f}")
-            if chick_quantity > 0 and selected_chick_breed:
-                st.markdown(f"- {chick_quantity} {selected_chick_breed['name']}: ${chick_cost:.2f}")
-            st.markdown(f"- Pickup fee: ${pickup_fee:.2f}")
-            st.markdown(f"**Total: ${total_cost:.2f}**")
-            
-            if chick_quantity > 0:
-                st.markdown("**⚠️ Important:** Chicks need heat, food, and water immediately upon pickup.")
-        
-        submitted = st.form_submit_button("🛒 Place Mixed Order", type="primary", use_container_width=True)
+        submitted = st.form_submit_button("🛒 Place Farm Store Order", type="primary", use_container_width=True)
         
-        if submitted and (egg_quantity > 0 or chick_quantity > 0):
+        if submitted:
+            order_lines = [
+                OrderLine(sku, quantity, catalog.by_sku[sku].price)
+                for sku, quantity in quantities.items() if quantity > 0
+            ]
+            if not order_lines:
+                st.error("Please select at least one product to order.")
+                return
             if not all([customer_name, customer_email, customer_phone]):
                 st.error("Please fill in all required fields (marked with *)")
+                return
+            
+            pickup_fee = pickup_options[pickup_choice]['fee']
+            total_cost = sum(float(line.line_total) for line in order_lines) + pickup_fee
+            has_chicks = any(catalog.by_sku[line.sku].subcategory == CHICK_LINE for line in order_lines)
+            
+            result = submit_order(
+                customer_name, customer_email, customer_phone, order_lines,
+                pickup_choice, payment_method, special_notes
+            )
+            if result is None:
+                st.error("❌ We couldn't place your order. Please try again or contact us directly.")
+            elif not (result.confirmed or result.queued):
+                sold_out_product = catalog.by_sku.get(result.sold_out_sku)
+                sold_out_name = sold_out_product.name if sold_out_product else "one of those products"
+                st.warning(f"😢 Sorry, {sold_out_name} just sold out! Your order was not placed - please adjust it and try again.")
             else:
                 # Order confirmation
                 st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                st.markdown("### ✅ Mixed Order Confirmed!")
+                st.markdown(f"### ✅ Farm Store Order {'Confirmed' if result.confirmed else 'Received'}!")
                 
                 order_details = f"""
                 **Order Details:**
+                - Order Number: {result.order_number}
                 - Customer: {customer_name}
                 """
                 
-                if egg_quantity > 0:
-                    order_details += f"- Eggs: {egg_quantity} dozen (${egg_cost:.2f})\n"
-                if chick_quantity > 0 and selected_chick_breed:
-                    order_details += f"- Chicks: {chick_quantity} {selected_chick_breed['name']} (${chick_cost:.2f})\n"
+                for line in order_lines:
+                    order_details += f"- {line.quantity} x {catalog.by_sku[line.sku].name} (${float(line.line_total):.2f})\n"
                 
-                order_details += f"""- Total: ${total_cost:.2f}
+                order_details += f"""- Pickup fee: ${pickup_fee:.2f}
+                - Total: ${total_cost:.2f}
                 - Pickup: {pickup_options[pickup_choice]['name']}
                 - Payment: {payment_method}
                 
@@ -916,7 +1285,7 @@ def show_mixed_ordering(egg_stock, chick_stock, egg_last_updated, chick_last_upd
                 We'll contact you within 2 hours to confirm pickup details and arrange payment.
                 """
                 
-                if chick_quantity > 0:
+                if has_chicks:
                     order_details += "\n**Remember:** Have your brooder setup ready with heat, food, and water!"
                 
                 st.markdown(order_details)
@@ -926,35 +1295,38 @@ def show_mixed_ordering(egg_stock, chick_stock, egg_last_updated, chick_last_upd
 # 4. REPLACE your sidebar inventory section in main() function with this:
 
 # In your main() function, replace the current sidebar inventory section with:
+@st.fragment(run_every=get_app_setting("cache", "sidebar_refresh_seconds", SIDEBAR_INVENTORY_REFRESH_INTERVAL))
 def update_sidebar_inventory():
-    """Update the sidebar with current inventory for both eggs and chicks"""
-    # Get inventory for both products
-    egg_stock, egg_last_updated = get_current_inventory()
-    chick_stock, chick_last_updated = get_chick_inventory()
+    """Sidebar availability panel; call inside `with st.sidebar`. Redraws on its own timer without rerunning the page"""
+    # A timed rerun doesn't re-execute the script, so this run's memo (get_inventory_snapshot) may be
+    # stale; read the shared inventory cache, which the LISTEN thread keeps current, instead
+    snapshot = load_inventory_snapshot()
+    egg_stock, egg_last_updated = snapshot.egg_stock, snapshot.egg_last_updated
+    chick_stock, chick_last_updated = snapshot.chick_stock, snapshot.chick_last_updated
     
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 📊 Current Availability")
+    st.markdown("---")
+    st.markdown("### 📊 Current Availability")
     
     # Eggs
     if egg_stock > 0:
-        st.sidebar.success(f"🥚 **{egg_stock} dozen eggs**")
+        st.success(f"🥚 **{egg_stock} dozen eggs**")
         egg_hours_ago = (datetime.now() - egg_last_updated).total_seconds() / 3600
         if egg_hours_ago > 24:
-            st.sidebar.warning(f"⚠️ Eggs updated {egg_hours_ago:.1f} hours ago")
+            st.warning(f"⚠️ Eggs updated {egg_hours_ago:.1f} hours ago")
     else:
-        st.sidebar.error("🥚 **Eggs sold out**")
+        st.error("🥚 **Eggs sold out**")
     
     # Chicks  
     if chick_stock > 0:
-        st.sidebar.success(f"🐣 **{chick_stock} chicks**")
+        st.success(f"🐣 **{chick_stock} chicks**")
         chick_hours_ago = (datetime.now() - chick_last_updated).total_seconds() / 3600
         if chick_hours_ago > 24:
-            st.sidebar.warning(f"⚠️ Chicks updated {chick_hours_ago:.1f} hours ago")
+            st.warning(f"⚠️ Chicks updated {chick_hours_ago:.1f} hours ago")
     else:
-        st.sidebar.error("🐣 **Chicks sold out**")
+        st.error("🐣 **Chicks sold out**")
     
     if egg_stock == 0 and chick_stock == 0:
-        st.sidebar.info("Check back tomorrow for fresh products!")
+        st.info("Check back tomorrow for fresh products!")
 
 
 
@@ -987,7 +1359,7 @@ def show_subscription_page():
     """, unsafe_allow_html=True)
     
     with col2:
-     st.image("pictures/eggs.jpeg", use_container_width=True)
+     show_image("pictures/eggs.jpeg", sizes="(max-width: 640px) 100vw, 365px")
     
     # Pricing
     st.markdown("---")
@@ -1078,179 +1450,11 @@ def show_chickens_page():
 )
     st.info("📸 **Photo Section:** Lundyn's photos of different chicken breeds go here!")
     
-    # Breed data with detailed information
-    breed_data = {
-        "egg_layers": {
-            "Australorps": {
-                "count": 12,
-                "egg_color": "Brown",
-                "temperament": "Docile",
-                "image_path": "pictures/australorp.jpg",
-                "description": "Known as one of the world's best laying breeds, Australorps are calm, friendly birds that consistently produce large brown eggs. They're excellent foragers and handle confinement well.",
-                "why_chosen": "We chose Australorps for their incredible laying ability and gentle nature around our daughters. They're perfect for families and produce beautiful, consistent brown eggs.",
-                "special_notes": "Excellent layers, can lay 250+ eggs per year"
-            },
-            "Rhode Island Reds": {
-                "count": 10,
-                "egg_color": "Brown",
-                "temperament": "Hardy",
-                "image_path": "pictures/reds.jpg",
-                "description": "Classic American breed known for excellent egg production and hardiness. These reliable birds are excellent foragers and consistently productive layers.",
-                "why_chosen": "These are the backbone of our brown egg production. Reliable, hardy, and consistently productive - exactly what a farm needs.",
-                "special_notes": "Great foragers, consistent production"
-            },
-            "Golden Comets": {
-                "count": 8,
-                "egg_color": "Brown",
-                "temperament": "Friendly",
-                "image_path": "pictures/comet.jpg",
-                "description": "A hybrid breed developed for commercial egg production. Known for their exceptional laying ability and friendly disposition.",
-                "why_chosen": "These girls are egg-laying machines! They start laying early and produce consistently throughout the year.",
-                "special_notes": "Early layers, high production"
-            },
-            "Olive Eggers": {
-                "count": 6,
-                "egg_color": "Olive Green",
-                "temperament": "Calm",
-                "image_path": "pictures/eggers.jpg",
-                "description": "A hybrid breed created by crossing dark brown egg layers with blue egg layers, resulting in beautiful olive-colored eggs. Calm, productive layers.",
-                "why_chosen": "The olive green eggs are incredible for our rainbow dozens. Customers are always amazed by the unique color.",
-                "special_notes": "Unique olive green eggs, great for rainbow dozens"
-            },
-            "Starlight Green Eggers": {
-                "count": 5,
-                "egg_color": "Green",
-                "temperament": "Friendly",
-                "image_path": "pictures/starlight.jpg",
-                "description": "A newer breed development that consistently lays green eggs. Friendly, productive birds that add beautiful color variety to egg collections.",
-                "why_chosen": "Another green egg variety that helps us create those stunning rainbow dozen collections that customers love.",
-                "special_notes": "Rare green eggs, consistent layers"
-            },
-            "Jersey Giants": {
-                "count": 4,
-                "egg_color": "Brown",
-                "temperament": "Gentle",
-                "image_path": "pictures/jerseys.jpg",
-                "description": "America's largest chicken breed! These gentle giants are calm, friendly birds that lay large brown eggs. Despite their size, they're excellent foragers.",
-                "why_chosen": "The kids love these gentle giants! They're incredibly calm and their extra-large eggs are perfect for baking.",
-                "special_notes": "Largest chicken breed, extra-large eggs"
-            },
-            "Sapphire Gems": {
-                "count": 7,
-                "egg_color": "Brown",
-                "temperament": "Active",
-                "image_path": "pictures/gems.jpg",
-                "description": "A newer breed with beautiful blue-gray feathering. Active foragers that lay consistently and handle free-range life very well.",
-                "why_chosen": "Their beautiful blue-gray coloring caught our eye, and they're excellent free-range birds that fit perfectly with our farming style.",
-                "special_notes": "Beautiful blue-gray feathers, excellent foragers"
-            },
-            "Cinnamon Queens": {
-                "count": 9,
-                "egg_color": "Brown",
-                "temperament": "Calm",
-                "image_path": "pictures/queens.jpg",
-                "description": "A hybrid breed known for exceptional egg production and beautiful reddish-brown feathering. Calm, productive birds that adapt well to various conditions.",
-                "why_chosen": "Their cinnamon-colored feathers are gorgeous, and they're incredibly productive layers that handle our climate well.",
-                "special_notes": "Beautiful cinnamon coloring, high production"
-            },
-            "Barred Rocks": {
-                "count": 8,
-                "egg_color": "Brown",
-                "temperament": "Friendly",
-                "image_path": "pictures/barredrock.jpg",
-                "description": "Classic American breed known for their distinctive black and white striped feathers. Hardy, cold-resistant birds that are great for free-ranging.",
-                "why_chosen": "These girls are tough as nails and handle our North Carolina weather beautifully. The kids love their distinctive 'barred' pattern.",
-                "special_notes": "Cold hardy, great for beginners"
-            },
-            "Buff Orpington": {
-                "count": 6,
-                "egg_color": "Brown",
-                "temperament": "Docile",
-                "image_path": "pictures/BO.jpg",
-                "description": "Known for their beautiful golden buff color and incredibly gentle nature. These fluffy birds are excellent mothers and consistent layers.",
-                "why_chosen": "The most gentle, cuddly chickens you'll ever meet! The girls love holding these sweet birds, and they're great with children.",
-                "special_notes": "Extremely gentle, great with kids"
-            },
-            "Midnight Majestics": {
-                "count": 5,
-                "egg_color": "Brown",
-                "temperament": "Calm",
-                "image_path": "pictures/majesty.jpg",
-                "description": "A newer breed with striking dark plumage and excellent laying ability. Calm birds that adapt well to free-range environments.",
-                "why_chosen": "Their dramatic dark feathers make them stand out in the flock, and they're reliable layers with great temperaments.",
-                "special_notes": "Striking dark plumage, reliable layers"
-            },
-            "Black Sex Link": {
-                "count": 7,
-                "egg_color": "Brown",
-                "temperament": "Active",
-                "image_path": "pictures/bsl.jpg",
-                "description": "A hybrid breed created by crossing specific breeds to create sex-linked chicks that can be sexed at hatching. Known for excellent egg production and hardiness.",
-                "why_chosen": "These girls are incredibly productive layers and the sex-linking trait made them easier to manage as chicks. They're reliable brown egg producers.",
-                "special_notes": "Sex-linked breed, excellent production"
-            },
-            "Zombies (Legbar/Ayam Mix)": {
-                "count": 4,
-                "egg_color": "Blue/Green",
-                "temperament": "Unique",
-                "image_path": "pictures/zombie.jpg",
-                "description": "Our own designer mix combining Cream Legbar genetics with Ayam Cemani. These unique birds produce colorful eggs with interesting genetic combinations.",
-                "why_chosen": "This is our experimental breeding project turned production layer. We're working on developing our own unique line with interesting egg colors and patterns.",
-                "special_notes": "Our custom breeding project, unique genetics"
-            },
-            "Barnyard Mixes": {
-                "count": 12,
-                "egg_color": "Mixed",
-                "temperament": "Varied",
-                "image_path": "pictures/barnyard.jpg",
-                "description": "Various mixed breed chickens that combine the best traits of multiple breeds. Each bird is unique with its own personality and egg characteristics.",
-                "why_chosen": "These girls represent the best of all worlds - hybrid vigor, unique appearances, and surprise egg colors. They're our 'wild cards.'",
-                "special_notes": "Hybrid vigor, unique combinations"
-            }
-        },
-        "specialty_breeders": {
-            "Black Copper Marans": {
-                "count": 8,
-                "egg_color": "Dark Brown/Chocolate",
-                "temperament": "Calm",
-                "image_path": "pictures/marans.jpg",
-                "description": "French breed famous for laying the darkest brown eggs of any chicken breed. The eggs are so dark they're often called 'chocolate eggs.'",
-                "why_chosen": "The chocolate-colored eggs are absolutely stunning and add incredible visual appeal to our rainbow dozens. Customers are blown away by how dark they are.",
-                "special_notes": "Darkest brown eggs in the world"
-            },
-            "Americanas": {
-                "count": 10,
-                "egg_color": "Blue/Green",
-                "temperament": "Gentle",
-                "image_path": "pictures/jimbo.jpg",
-                "description": "Often called 'Easter Eggers,' these friendly birds lay eggs in various shades of blue and green. Each hen's eggs are a slightly different shade.",
-                "why_chosen": "The variety of blue and green shades makes every collection exciting. Perfect for our breeding program to maintain colorful egg genetics.",
-                "special_notes": "Easter eggers, variety of blue/green shades"
-            },
-            "Barred Rock/Rustic Rock": {
-                "count": 6,
-                "egg_color": "Brown",
-                "temperament": "Friendly",
-                "image_path": "pictures/barredrock.jpg",
-                "description": "Classic American breed selected for breeding purposes. These birds carry excellent genetics for hardiness, productivity, and temperament.",
-                "why_chosen": "We're using these for our breeding program because of their proven genetics, hardiness, and excellent maternal instincts.",
-                "special_notes": "Selected breeding stock, excellent mothers"
-            },
-            "Cream Legbars": {
-                "count": 5,
-                "egg_color": "Blue",
-                "temperament": "Active",
-                "image_path": "pictures/legbar.jpg",
-                "description": "A rare auto-sexing breed that lays beautiful blue eggs. Active foragers with a distinctive crest, they're excellent free-range birds.",
-                "why_chosen": "The blue eggs are stunning, and being auto-sexing makes breeding much easier. These are key to our blue egg genetics.",
-                "special_notes": "Auto-sexing breed, rare blue eggs"
-            }
-        }
-    }
+    catalog = get_product_catalog()
     
     # Current flock summary
-    total_layers = sum(breed["count"] for breed in breed_data["egg_layers"].values())
-    total_breeders = sum(breed["count"] for breed in breed_data["specialty_breeders"].values())
+    total_layers = catalog.flock_size("egg_layers")
+    total_breeders = catalog.flock_size("specialty_breeders")
     
     st.markdown(f"""
 <div style="background: linear-gradient(135deg, #f5f5f5, #ffffff);
@@ -1306,11 +1510,10 @@ def show_chickens_page():
         
         # Create breed buttons in a grid
         cols = st.columns(3)
-        for i, (breed_name, breed_info) in enumerate(breed_data["egg_layers"].items()):
+        for i, breed in enumerate(catalog.breeds_in("egg_layers")):
             with cols[i % 3]:
-                if st.button(f"🐔 {breed_name}", key=f"layer_{breed_name}", use_container_width=True):
-                    st.session_state.selected_breed = breed_name
-                    st.session_state.selected_category = "egg_layers"
+                if st.button(f"🐔 {breed.name}", key=f"layer_{breed.name}", use_container_width=True):
+                    st.session_state.selected_breed = breed.name
     
     with tab2:
         st.markdown("### Our Breeding & Specialty Birds")
@@ -1318,17 +1521,15 @@ def show_chickens_page():
         
         # Create breed buttons in a grid
         cols = st.columns(3)
-        for i, (breed_name, breed_info) in enumerate(breed_data["specialty_breeders"].items()):
+        for i, breed in enumerate(catalog.breeds_in("specialty_breeders")):
             with cols[i % 3]:
-                if st.button(f"🐣 {breed_name}", key=f"breeder_{breed_name}", use_container_width=True):
-                    st.session_state.selected_breed = breed_name
-                    st.session_state.selected_category = "specialty_breeders"
+                if st.button(f"🐣 {breed.name}", key=f"breeder_{breed.name}", use_container_width=True):
+                    st.session_state.selected_breed = breed.name
     
     # Display selected breed details
-    if hasattr(st.session_state, 'selected_breed') and hasattr(st.session_state, 'selected_category'):
-        breed_name = st.session_state.selected_breed
-        category = st.session_state.selected_category
-        breed_info = breed_data[category][breed_name]
+    breed_info = catalog.by_breed.get(st.session_state.get("selected_breed"))
+    if breed_info is not None:
+        breed_name = breed_info.name
         
         st.markdown("---")
         
@@ -1338,7 +1539,8 @@ def show_chickens_page():
         with col1:
             # Actual breed photo
             try:
-                st.image(breed_info["image_path"], caption=breed_name, use_container_width=True)
+                show_image(breed_info.image_path, caption=breed_name,
+                           sizes="(max-width: 640px) 100vw, 245px")
             except:
                 # Fallback placeholder if image not found
                 st.markdown(f"""
@@ -1360,23 +1562,23 @@ def show_chickens_page():
             # Key stats
             col_stats1, col_stats2, col_stats3 = st.columns(3)
             with col_stats1:
-                st.metric("Count", breed_info["count"])
+                st.metric("Count", breed_info.count)
             with col_stats2:
-                st.metric("Egg Color", breed_info["egg_color"])
+                st.metric("Egg Color", breed_info.egg_color)
             with col_stats3:
-                st.metric("Temperament", breed_info["temperament"])
+                st.metric("Temperament", breed_info.temperament)
             
             # Description
             st.markdown("### About This Breed")
-            st.markdown(breed_info["description"])
+            st.markdown(breed_info.description)
             
             # Why we chose them
             st.markdown("### Why We Chose Them")
-            st.markdown(f"*{breed_info['why_chosen']}*")
+            st.markdown(f"*{breed_info.why_chosen}*")
             
             # Special notes
             st.markdown("### Special Notes")
-            st.markdown(f"**{breed_info['special_notes']}**")
+            st.markdown(f"**{breed_info.special_notes}**")
     
     else:
         st.markdown("---")
@@ -1428,196 +1630,93 @@ def show_chickens_page():
 
     st.markdown("---")
 
-def create_pickup_locations_map():
-    """Create an interactive map showing LMW Farm pickup locations"""
-    
-    # Location data with coordinates (you may need to adjust these slightly)
-    locations = [
-        {
-            'name': '🏡 LMW Farm',
-            'lat': 36.4580,
-            'lon': -80.6140,
-            'category': 'farm',
-            'address': '193 Caterpillar Trail, Mt Airy, NC',
-            'status': 'Home Base',
-            'details': 'Fresh eggs collected daily from our free-range chickens',
-            'hours': 'Dawn to Dusk, 7 days a week',
-            'distance': '0 miles',
-            'color': '#8B4513',
-            'size': 20
-        },
-        # Active Farmers Markets
-        {
-            'name': '🌾 Mount Airy Farmers Market',
-            'lat': 36.4993,
-            'lon': -80.6081,
-            'category': 'active_market',
-            'address': '232 W. Independence Blvd., Mount Airy, NC',
-            'status': 'Active - Fridays',
-            'details': 'Our primary Friday morning market location',
-            'hours': 'Fridays 9:00 AM - 12:00 PM (April-September)',
-            'distance': '4-7 miles from farm',
-            'color': '#4CAF50',
-            'size': 15
-        },
-        {
-            'name': '🌾 Dobson Farmers Market',
-            'lat': 36.3970,
-            'lon': -80.7240,
-            'category': 'active_market',
-            'address': '903 East Atkins Street, Dobson, NC',
-            'status': 'Active - Fridays',
-            'details': 'Our Friday afternoon market location',
-            'hours': 'Fridays 3:00 PM - 6:00 PM (May-September)',
-            'distance': '12-15 miles from farm',
-            'color': '#4CAF50',
-            'size': 15
-        },
-        # Strategic Pickup Locations
-        {
-            'name': '🏬 Mayberry Mall',
-            'lat': 36.5089,
-            'lon': -80.6170,
-            'category': 'pickup_location',
-            'address': '388 Frederick Street, Mount Airy, NC',
-            'status': 'Coming Soon',
-            'details': 'Primary pickup hub serving five counties',
-            'hours': 'TBD - Regional shopping center',
-            'distance': '5-8 miles from farm',
-            'color': '#2196F3',
-            'size': 12
-        },
-        {
-            'name': '📚 Mount Airy Public Library',
-            'lat': 36.4889,
-            'lon': -80.6070,
-            'category': 'pickup_location',
-            'address': '145 Rockford Street, Mount Airy, NC',
-            'status': 'Coming Soon',
-            'details': 'Downtown community gathering place',
-            'hours': 'TBD - Library hours',
-            'distance': '4-7 miles from farm',
-            'color': '#2196F3',
-            'size': 10
-        },
-        {
-            'name': '🏔️ Pilot Mountain Library',
-            'lat': 36.3856,
-            'lon': -80.4700,
-            'category': 'pickup_location',
-            'address': '319 West Main Street, Pilot Mountain, NC',
-            'status': 'Coming Soon',
-            'details': 'Serving eastern Surry County',
-            'hours': 'TBD - Library hours',
-            'distance': '15-18 miles from farm',
-            'color': '#2196F3',
-            'size': 10
-        },
-        {
-            'name': '🎓 Surry Community College',
-            'lat': 36.3889,
-            'lon': -80.4650,
-            'category': 'pickup_location',
-            'address': '612 East Main Street, Pilot Mountain, NC',
-            'status': 'Coming Soon',
-            'details': 'College campus with large parking area',
-            'hours': 'TBD - Campus hours',
-            'distance': '16-19 miles from farm',
-            'color': '#2196F3',
-            'size': 10
-        },
-        # Future Markets
-        {
-            'name': '🌾 King Farmers Market',
-            'lat': 36.2789,
-            'lon': -80.3589,
-            'category': 'future_market',
-            'address': '105 Moore Road, King, NC',
-            'status': 'Future Expansion',
-            'details': 'Wednesdays market serving Stokes County',
-            'hours': 'Wednesdays 11:00 AM - 1:00 PM (April-October)',
-            'distance': '25-28 miles from farm',
-            'color': '#FF9800',
-            'size': 8
-        },
-        {
-            'name': '🌾 Elkin Farmers Market',
-            'lat': 36.2448,
-            'lon': -80.8509,
-            'category': 'future_market',
-            'address': '226 North Bridge Street, Elkin, NC',
-            'status': 'Future Expansion',
-            'details': '45+ vendors with covered space and live music',
-            'hours': 'Saturdays 9:00 AM - 12:00 PM (April-TBD)',
-            'distance': '20-23 miles from farm',
-            'color': '#FF9800',
-            'size': 8
-        },
-        {
-            'name': '🌾 Pilot Mountain Market',
-            'lat': 36.3856,
-            'lon': -80.4700,
-            'category': 'future_market',
-            'address': '300 South Key Street, Pilot Mountain, NC',
-            'status': 'Future Expansion',
-            'details': 'Saturday afternoon market',
-            'hours': 'Saturdays 3:00 PM - 6:00 PM (April-October)',
-            'distance': '15-18 miles from farm',
-            'color': '#FF9800',
-            'size': 8
-        }
-    ]
-    
-    # Create the map
+# Marker styling per location category, in legend order
+PICKUP_MAP_CATEGORIES = {
+    'farm': {'label': 'Home Base', 'color': '#8B4513', 'size': 20, 'showlegend': False},
+    'active_market': {'label': 'Active - Fridays', 'color': '#4CAF50', 'size': 15, 'showlegend': True},
+    'pickup_location': {'label': 'Coming Soon', 'color': '#2196F3', 'size': 10, 'showlegend': True},
+    'future_market': {'label': 'Future Expansion', 'color': '#FF9800', 'size': 8, 'showlegend': True},
+}
+PICKUP_MAP_COVERAGE_MILES = (5, 10, 15)
+PICKUP_MAP_HEIGHT = 500
+
+def coverage_ring(lat, lon, radius_miles, points=24):
+    """Lat/lon outline of a circle of radius_miles around a point (great-circle destinations)"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    angular = radius_miles / EARTH_RADIUS_MILES
+    lats, lons = [], []
+    for step in range(points + 1):
+        bearing = 2 * math.pi * step / points
+        lat2 = math.asin(math.sin(lat1) * math.cos(angular) +
+                         math.cos(lat1) * math.sin(angular) * math.cos(bearing))
+        lon2 = lon1 + math.atan2(math.sin(bearing) * math.sin(angular) * math.cos(lat1),
+                                 math.cos(angular) - math.sin(lat1) * math.sin(lat2))
+        # 4 decimals is ~10 m, plenty for a ring and keeps the figure JSON small
+        lats.append(round(math.degrees(lat2), 4))
+        lons.append(round(math.degrees(lon2), 4))
+    return lats, lons
+
+def create_pickup_locations_map(locations):
+    """Interactive map of LMW Farm pickup locations"""
+    import plotly.graph_objects as go
+    farm = next((location for location in locations if location['category'] == 'farm'),
+                DEFAULT_PICKUP_LOCATIONS[0])
     fig = go.Figure()
     
-    # Add markers for each location
-    for location in locations:
-        # Create hover text
-        hover_text = f"""
-        <b>{location['name']}</b><br>
-        📍 {location['address']}<br>
-        📏 {location['distance']}<br>
-        ⏰ {location['hours']}<br>
-        📋 {location['status']}<br>
-        💡 {location['details']}
-        """
-        
-        fig.add_trace(go.Scattermapbox(
-            lat=[location['lat']],
-            lon=[location['lon']],
+    # Coverage rings around the farm, drawn as one trace (None breaks the line between rings)
+    ring_lats, ring_lons = [], []
+    for radius in PICKUP_MAP_COVERAGE_MILES:
+        lats, lons = coverage_ring(farm['lat'], farm['lon'], radius)
+        ring_lats += lats + [None]
+        ring_lons += lons + [None]
+    fig.add_trace(go.Scattermap(
+        lat=ring_lats,
+        lon=ring_lons,
+        mode='lines',
+        line=dict(width=1.5, color='rgba(46,125,50,0.5)'),
+        name=f"{', '.join(str(radius) for radius in PICKUP_MAP_COVERAGE_MILES)}-mile coverage",
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    
+    # One trace per category; per-point details ride along in customdata
+    hover_template = (
+        "<b>%{text}</b><br>"
+        "📍 %{customdata[0]}<br>"
+        "📏 %{customdata[1]}<br>"
+        "⏰ %{customdata[2]}<br>"
+        "📋 %{customdata[3]}<br>"
+        "💡 %{customdata[4]}"
+        "<extra></extra>"
+    )
+    for category, style in PICKUP_MAP_CATEGORIES.items():
+        members = [location for location in locations if location['category'] == category]
+        if not members:
+            continue
+        fig.add_trace(go.Scattermap(
+            lat=[location['lat'] for location in members],
+            lon=[location['lon'] for location in members],
             mode='markers',
-            marker=dict(
-                size=location['size'],
-                color=location['color'],
-                opacity=0.8
-            ),
-            text=location['name'],
-            hovertemplate=hover_text + "<extra></extra>",
-            name=location['status'],
-            showlegend=False if location['category'] == 'farm' else True
+            marker=dict(size=style['size'], color=style['color'], opacity=0.8),
+            text=[f"{location['icon']} {location['name']}" for location in members],
+            customdata=[
+                [f"{location['address']}, {location['city']}, {location['state']}",
+                 location['distance'], location['hours'], location['status'], location['details']]
+                for location in members
+            ],
+            hovertemplate=hover_template,
+            name=style['label'],
+            showlegend=style['showlegend']
         ))
     
-    # Add coverage circles around the farm
-    # 15-mile radius circle
-    fig.add_trace(go.Scattermapbox(
-        lat=[36.4580],
-        lon=[-80.6140],
-        mode='markers',
-        marker=dict(size=0, opacity=0),
-        name='15-mile radius',
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-    
     # Update layout
     fig.update_layout(
-        mapbox=dict(
+        map=dict(
             style="open-street-map",
-            center=dict(lat=36.4580, lon=-80.6140),
+            center=dict(lat=farm['lat'], lon=farm['lon']),
             zoom=9.5
         ),
-        height=500,
+        height=PICKUP_MAP_HEIGHT,
         margin=dict(l=0, r=0, t=30, b=0),
         title=dict(
             text="🗺️ LMW Farm Strategic Coverage Area",
@@ -1637,6 +1736,17 @@ def create_pickup_locations_map():
     
     return fig
 
+@st.cache_resource(max_entries=4, show_spinner=False)
+def pickup_locations_map_html(locations):
+    """The pickup map serialized once per version of the location data
+
+    Cached as an HTML string rather than a figure: st.plotly_chart would
+    re-serialize a cached figure to JSON on every render.
+    """
+    return create_pickup_locations_map(locations).to_html(
+        include_plotlyjs='cdn', full_html=False, config={'responsive': True}
+    )
+
 # Updated pickup locations function with the interactive map
 def show_pickup_locations():
     """Pickup location information with interactive map"""
@@ -1655,8 +1765,9 @@ def show_pickup_locations():
     st.markdown("*Click and explore our strategic locations throughout Surry County*")
     
     # Create and display the interactive map
-    map_fig = create_pickup_locations_map()
-    st.plotly_chart(map_fig, use_container_width=True)
+    pickup_locations = get_pickup_locations()
+    # Plotly escapes < and > in the figure JSON, so location text can't break out of the page
+    st.iframe(pickup_locations_map_html(pickup_locations), height=PICKUP_MAP_HEIGHT + 20)
     
     # Map Legend
     st.markdown("""
@@ -1666,6 +1777,31 @@ def show_pickup_locations():
     **🟠 Orange:** Future Market Expansion  
     """)
     
+    # Nearest pickup finder
+    st.markdown("### 🧭 Find Your Nearest Pickup")
+    st.markdown("*Enter your coordinates (right-click your home in any online map to copy them)*")
+    coord_col1, coord_col2 = st.columns(2)
+    with coord_col1:
+        customer_lat = st.number_input("Latitude", min_value=-90.0, max_value=90.0, value=None,
+                                       format="%.4f", placeholder="36.4993")
+    with coord_col2:
+        customer_lon = st.number_input("Longitude", min_value=-180.0, max_value=180.0, value=None,
+                                       format="%.4f", placeholder="-80.6081")
+    if customer_lat is not None and customer_lon is not None:
+        location_index = get_pickup_location_index(pickup_locations)
+        # Only places that take orders today; planned sites are listed on their own below
+        for location, miles in location_index.nearest(customer_lat, customer_lon, k=3, offered_only=True):
+            st.markdown(
+                f"**{location['icon']} {location['name']}** - {miles:.1f} miles  \n"
+                f"📍 {location['address']}, {location['city']} · ⏰ {location['hours']} · 📋 {location['status']}"
+            )
+        planned = [(location, miles) for location, miles in location_index.nearest(customer_lat, customer_lon, k=3)
+                   if not location['offered']]
+        if planned:
+            st.markdown("*Planned near you (not taking orders yet):*")
+            for location, miles in planned:
+                st.caption(f"{location['icon']} {location['name']} - {miles:.1f} miles · {location['status']}")
+    
     # Strategic Pickup Locations Section
     st.markdown("---")
     st.markdown("## 🏪 Strategic Pickup Locations")
@@ -1729,20 +1865,8 @@ def show_pickup_locations():
     st.markdown("## 🌾 Farmers Markets")
     st.markdown("## Find us at these local farmers markets with fresh eggs every week!*")
      
-    image_path = os.path.join("pictures", "Signage.jpg")
-    
-    with open(image_path, "rb") as img_file:
-     img_base64 = base64.b64encode(img_file.read()).decode()
-
-# Inject into HTML for centering and sizing
-    st.markdown(
-    f"""
-    <div style="display: flex; justify-content: center;">
-        <img src="data:image/jpeg;base64,{img_base64}" style="max-width:900px; width:100%; border-radius:12px;">
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+    show_image("pictures/Signage.jpg", sizes="(max-width: 900px) 100vw, 900px",
+               style="max-width: 900px; width: 100%; height: auto; border-radius: 12px;")
     
     # Active Markets
     st.markdown("### 🟢 Current Market Schedule")
@@ -1822,11 +1946,9 @@ def show_pickup_locations():
 
     with col1:
         try:
-            from PIL import Image
-        # Load and resize the store image to uniform dimensions
-            store_img = Image.open("pictures/store.jpg")
-            store_resized = store_img.resize((400, 250))  # width=400, height=250
-            st.image(store_resized, caption="Future farm store concept", use_container_width=True)
+            # Pre-sized to 400x250 by build_assets.py so both concept photos line up
+            show_image("pictures/store.jpg", caption="Future farm store concept",
+                       sizes="(max-width: 640px) 100vw, 365px")
         except:
             st.info("📸 Store concept photo coming soon!")
     
@@ -1848,11 +1970,8 @@ def show_pickup_locations():
 
     with col2:
         try:
-            from PIL import Image
-        # Load and resize the locker image to the same uniform dimensions
-            locker_img = Image.open("pictures/locker.jpg")
-            locker_resized = locker_img.resize((400, 250))  # Same dimensions: width=400, height=250
-            st.image(locker_resized, caption="Refrigerated locker system", use_container_width=True)
+            show_image("pictures/locker.jpg", caption="Refrigerated locker system",
+                       sizes="(max-width: 640px) 100vw, 365px")
         except:
             st.info("📸 Locker system photo coming soon!")
     
@@ -1918,6 +2037,35 @@ def show_pickup_locations():
     st.markdown("---")
     st.info("💡 **Note:** All pickup locations and market schedules are subject to change. We'll notify customers of any updates via email or phone.")
 
+def save_contact_form(name, email, subject, message):
+    """Save a contact form message, journaling it if the database can't be reached"""
+    submitted_at = datetime.now()
+    try:
+        conn = init_connection_pool().getconn()
+    except (psycopg2.OperationalError, PoolError):
+        conn = None
+    
+    if conn is not None:
+        try:
+            save_contact_message(conn, name, email, subject, message, submitted_at)
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            pass  # Journaled below
+        except Exception as e:
+            st.error(f"Error saving your message: {e}")
+            return False
+        finally:
+            release_database_connection(conn)
+    
+    try:
+        get_offline_journal().append('contact', {
+            'name': name, 'email': email, 'subject': subject, 'message': message, 'submitted_at': submitted_at
+        })
+        return True
+    except Exception as e:
+        st.error(f"Error saving your message: {e}")
+        return False
+
 def show_contact_page():
     """Contact information and form"""
     # Header section matching other pages - BIG title
@@ -2003,8 +2151,11 @@ def show_contact_page():
             
             if submitted:
                 if name and email and message:
-                    st.success("✅ Message sent successfully! We'll get back to you within 24 hours.")
-                    st.balloons()
+                    if save_contact_form(name, email, subject, message):
+                        st.success("✅ Message sent successfully! We'll get back to you within 24 hours.")
+                        st.balloons()
+                    else:
+                        st.error("❌ We couldn't send your message. Please email or call us directly.")
                 else:
                     st.error("❌ Please fill in all required fields (*)")
         
@@ -2046,6 +2197,57 @@ def show_contact_page():
         </div>
         """, unsafe_allow_html=True)
 
+@st.cache_data(ttl=REPORTS_CACHE_TTL, show_spinner=False)
+def fetch_sales_reports():
+    """Read the stored sales reports (refreshed incrementally by reports.py)"""
+    conn = init_connection_pool().getconn()
+    try:
+        return {name: load_report(conn, name) for name in REPORT_QUERIES}
+    finally:
+        release_database_connection(conn)
+
+def get_sales_reports():
+    """Get the stored sales reports, or None if they can't be read"""
+    try:
+        return fetch_sales_reports()
+    except Exception as e:
+        st.error(f"Error loading reports: {e}")
+        return None
+
+@st.cache_data(ttl=REPORTS_CACHE_TTL, show_spinner="Crunching order history...")
+def fetch_revenue_breakdown(start_date, end_date, statuses):
+    """Stream vw_order_details into revenue breakdowns; cached per filter combination"""
+    conn = init_connection_pool().getconn()
+    try:
+        return revenue_breakdown(conn, start_date, end_date, statuses)
+    finally:
+        release_database_connection(conn)
+
+def get_revenue_breakdown(start_date, end_date, statuses):
+    """Get revenue breakdowns for the given filters, or None if they can't be computed"""
+    try:
+        return fetch_revenue_breakdown(start_date, end_date, tuple(sorted(statuses)))
+    except Exception as e:
+        st.error(f"Error building revenue breakdown: {e}")
+        return None
+
+def refresh_reports():
+    """Run an incremental report refresh now instead of waiting for the scheduled job"""
+    conn = init_database_connection()
+    if not conn:
+        return False
+    
+    try:
+        refresh_sales_reports(conn)
+        fetch_sales_reports.clear()
+        fetch_revenue_breakdown.clear()
+        return True
+    except Exception as e:
+        st.error(f"Error refreshing reports: {e}")
+        return False
+    finally:
+        release_database_connection(conn)
+
 def show_admin_panel():
     """Admin panel for farm management"""
     
@@ -2071,11 +2273,24 @@ def show_admin_panel():
     with tab1:
         st.markdown("## Inventory Management")
         
-        current_stock, last_updated = get_current_inventory()
+        # Every active product in the catalog can be stocked from here, eggs first
+        catalog = get_product_catalog()
+        stock_skus = [EGG_SKU] + [sku for sku in catalog.by_sku if sku != EGG_SKU]
+        stock_sku = st.selectbox(
+            "Product",
+            options=stock_skus,
+            format_func=lambda sku: f"{product_line_label(catalog.by_sku[sku].subcategory)} - {catalog.by_sku[sku].name} ({sku})"
+                if sku in catalog.by_sku else f"Eggs ({sku})"
+        )
+        if stock_sku == EGG_SKU:
+            current_stock, last_updated = get_current_inventory()
+        else:
+            product = catalog.by_sku[stock_sku]
+            current_stock, last_updated = product.current_stock, product.updated_date or datetime.now()
         
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Current Stock", f"{current_stock} dozen")
+            st.metric("Current Stock", f"{current_stock} dozen" if stock_sku == EGG_SKU else f"{current_stock} units")
         with col2:
             st.metric("Last Updated", f"{(datetime.now() - last_updated).total_seconds() / 3600:.1f} hours ago")
         
@@ -2085,7 +2300,7 @@ def show_admin_panel():
             notes = st.text_input("Notes", placeholder="Daily collection, manual adjustment, etc.")
             
             if st.form_submit_button("Update Inventory"):
-                if update_inventory(new_stock, notes):
+                if update_inventory(new_stock, notes, sku=stock_sku):
                     st.success("✅ Inventory updated successfully!")
                     st.rerun()
                 else:
@@ -2102,9 +2317,53 @@ def show_admin_panel():
         # Here you would display customer information
     
     with tab4:
+        import pandas as pd
         st.markdown("## Farm Reports")
-        st.info("📊 Reporting dashboard coming soon!")
-        # Here you would show sales reports, trends, etc.
+        
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            if st.button("🔄 Refresh Reports", use_container_width=True):
+                if refresh_reports():
+                    st.success("✅ Reports refreshed!")
+        
+        reports = get_sales_reports()
+        if reports is None:
+            st.info("📊 Reports are not available yet - run the report setup SQL and refresh job.")
+        else:
+            st.markdown("### 🥚 Sales by Product")
+            st.dataframe(pd.DataFrame(reports["sales_by_product"]), use_container_width=True, hide_index=True)
+            
+            st.markdown("### 📅 Sales by Month")
+            monthly = pd.DataFrame(reports["sales_by_month"])
+            st.dataframe(monthly, use_container_width=True, hide_index=True)
+            if not monthly.empty:
+                monthly["period"] = monthly["year"].astype(str) + "-" + monthly["month"].astype(str).str.zfill(2)
+                st.bar_chart(monthly.set_index("period")["total_revenue"].astype(float))
+            
+            st.markdown("### 👥 Customer Lifetime Value")
+            st.dataframe(pd.DataFrame(reports["customer_ltv"]), use_container_width=True, hide_index=True)
+        
+        st.markdown("### 💰 Revenue Breakdown")
+        today = datetime.now().date()
+        filter_col1, filter_col2 = st.columns(2)
+        with filter_col1:
+            date_range = st.date_input("Order dates", value=(today.replace(month=1, day=1), today))
+        with filter_col2:
+            statuses = st.multiselect("Order status", ["pending", "confirmed", "fulfilled", "cancelled"],
+                                      default=["confirmed", "fulfilled"])
+        
+        # The range picker returns a single date until both ends are chosen
+        if len(date_range) == 2 and statuses:
+            breakdown = get_revenue_breakdown(date_range[0], date_range[1], statuses)
+            if breakdown is not None and breakdown["product"].empty:
+                st.info("No orders match these filters.")
+            elif breakdown is not None:
+                breakdown_tabs = st.tabs(["By Product", "By Season", "By Location", "By Payment Method"])
+                for breakdown_tab, name in zip(breakdown_tabs, ["product", "season", "location", "payment_method"]):
+                    with breakdown_tab:
+                        table = breakdown[name]
+                        st.bar_chart(table.set_index(table.columns[0])["revenue"])
+                        st.dataframe(table, use_container_width=True, hide_index=True)
     
     # Logout button
     if st.button("🚪 Logout"):
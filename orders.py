@@ -0,0 +1,149 @@
+"""Order write path for the LMW Farm storefront
+
+Kept free of Streamlit so the order forms in main.py and offline tools share
+the same reservation logic.
+"""
+import secrets
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from psycopg2 import errors
+from psycopg2.extras import execute_values
+
+
+@dataclass(frozen=True)
+class OrderLine:
+    """One product on an order, priced as quoted to the customer"""
+    sku: str
+    quantity: int
+    unit_price: Decimal
+
+    @property
+    def line_total(self):
+        return Decimal(str(self.unit_price)) * self.quantity
+
+
+@dataclass(frozen=True)
+class OrderResult:
+    """Outcome of place_order: confirmed with an order number, or sold out
+
+    Two more statuses carry an order number without a new order being written:
+    'duplicate' (an order with the number passed to place_order already
+    exists) and 'queued' (main.py journaled it while the database was down).
+    """
+    status: str
+    order_number: Optional[str] = None
+    sold_out_sku: Optional[str] = None
+
+    @property
+    def confirmed(self):
+        return self.status == 'confirmed'
+
+    @property
+    def queued(self):
+        return self.status == 'queued'
+
+
+def generate_order_number():
+    """Create a human-friendly, practically unique order number"""
+    return f"LMW-{datetime.now():%Y%m%d}-{secrets.token_hex(3).upper()}"
+
+
+def merge_order_lines(lines):
+    """Combine lines for the same SKU and sort by SKU so row locks are always taken in the same order"""
+    merged = {}
+    for line in lines:
+        if line.sku in merged:
+            existing = merged[line.sku]
+            merged[line.sku] = OrderLine(line.sku, existing.quantity + line.quantity, existing.unit_price)
+        else:
+            merged[line.sku] = line
+    return [merged[sku] for sku in sorted(merged)]
+
+
+def order_exists(cur, order_number):
+    cur.execute("SELECT 1 FROM orders WHERE order_number = %s", (order_number,))
+    return cur.fetchone() is not None
+
+
+def place_order(conn, customer_name, customer_email, customer_phone, lines,
+                pickup_method, pickup_fee=0, payment_method=None, notes=None, order_number=None):
+    """Reserve stock, write the order and its lines, and log the sale in one transaction
+
+    Stock is reserved with a conditional decrement, so two customers racing for
+    the last dozen can never both succeed. If any line can't be filled the whole
+    order is rolled back and a sold-out result names the first short SKU.
+
+    Passing an order_number makes the call idempotent: if that order was
+    already written, nothing changes - stock included, even if it has sold out
+    since - and the result is 'duplicate'. Only pass one for an order that may
+    already exist (a replay); a freshly generated number that collides with
+    another order also comes back as 'duplicate'.
+    """
+    caller_order_number = order_number is not None
+    lines = [line for line in merge_order_lines(lines) if line.quantity > 0]
+    if not lines:
+        raise ValueError("an order needs at least one product")
+
+    try:
+        with conn.cursor() as cur:
+            if caller_order_number and order_exists(cur, order_number):
+                conn.rollback()
+                return OrderResult('duplicate', order_number=order_number)
+
+            reserved = []
+            for line in lines:
+                cur.execute("""
+                    UPDATE products
+                    SET current_stock = current_stock - %(quantity)s, updated_date = %(now)s
+                    WHERE sku = %(sku)s AND is_active = true AND current_stock >= %(quantity)s
+                    RETURNING id, current_stock + %(quantity)s AS previous_stock, current_stock AS new_stock
+                """, {'sku': line.sku, 'quantity': line.quantity, 'now': datetime.now()})
+                row = cur.fetchone()
+                if row is None:
+                    conn.rollback()
+                    # Another replay of this order may have taken the stock and committed while we waited on the row
+                    if caller_order_number and order_exists(cur, order_number):
+                        conn.rollback()
+                        return OrderResult('duplicate', order_number=order_number)
+                    return OrderResult('sold_out', sold_out_sku=line.sku)
+                reserved.append((line, row))
+
+            order_number = order_number or generate_order_number()
+            order_total = sum((line.line_total for line in lines), Decimal(str(pickup_fee)))
+            cur.execute("""
+                INSERT INTO orders
+                (order_number, customer_name, customer_email, customer_phone, pickup_method,
+                 pickup_fee, payment_method, notes, order_total, order_status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'confirmed')
+                RETURNING id
+            """, (order_number, customer_name, customer_email, customer_phone, pickup_method,
+                  pickup_fee, payment_method, notes, order_total))
+            order_id = cur.fetchone()[0]
+
+            execute_values(cur, """
+                INSERT INTO order_items (order_id, product_id, quantity, unit_price, line_total)
+                VALUES %s
+            """, [(order_id, product_id, line.quantity, line.unit_price, line.line_total)
+                  for line, (product_id, _, _) in reserved])
+
+            execute_values(cur, """
+                INSERT INTO inventory_transactions
+                (product_id, transaction_type, quantity_change, previous_stock, new_stock, notes)
+                VALUES %s
+            """, [(product_id, 'sale', -line.quantity, previous_stock, new_stock, f"Order {order_number}")
+                  for line, (product_id, previous_stock, new_stock) in reserved])
+
+        conn.commit()
+        return OrderResult('confirmed', order_number=order_number)
+    except errors.UniqueViolation:
+        # orders.order_number is unique; the stock reserved above is released with the rollback
+        conn.rollback()
+        if not caller_order_number:
+            raise
+        return OrderResult('duplicate', order_number=order_number)
+    except Exception:
+        conn.rollback()
+        raise
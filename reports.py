@@ -0,0 +1,155 @@
+"""Sales reporting for the LMW Farm admin panel
+
+Refresh job for the stored sales reports defined in
+"-- LMW FARM - MATERIALIZED SALES REPORTS.pgsql". Run it from cron, e.g.
+every 15 minutes:
+
+    DATABASE_URL=postgresql://localhost/lmw_farm python reports.py refresh
+
+Ad-hoc revenue breakdowns stream vw_order_details through a server-side
+cursor, so memory stays flat however much order history there is.
+"""
+import argparse
+import os
+import sys
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+REPORT_QUERIES = {
+    "sales_by_product": """
+        SELECT product_name, category, subcategory, total_orders,
+               total_quantity_sold, total_revenue, avg_unit_price
+        FROM rpt_sales_by_product
+        ORDER BY total_revenue DESC
+    """,
+    "sales_by_month": """
+        SELECT year, month, month_name, total_orders, total_revenue, avg_order_value
+        FROM rpt_sales_by_month
+        ORDER BY year, month
+    """,
+    "customer_ltv": """
+        SELECT email, first_name, last_name, total_orders, lifetime_value,
+               first_purchase_date, last_purchase_date
+        FROM rpt_customer_ltv
+        ORDER BY lifetime_value DESC
+    """,
+}
+
+# Breakdown name -> vw_order_details column it groups by
+REVENUE_DIMENSIONS = {
+    "product": "product_name",
+    "season": "season",
+    "location": "location_name",
+    "payment_method": "payment_method",
+}
+STREAM_CHUNK_SIZE = 5000
+DEFAULT_REPORT_STATUSES = ("confirmed", "fulfilled")
+
+
+def stream_order_details(conn, start_date=None, end_date=None, statuses=DEFAULT_REPORT_STATUSES,
+                         chunk_size=STREAM_CHUNK_SIZE):
+    """Yield vw_order_details rows as DataFrames of at most chunk_size rows with categorical dimensions"""
+    import pandas as pd  # imported here so main.py and the refresh job don't load pandas until it's needed
+    conditions, params = ["order_status = ANY(%s)"], [list(statuses)]
+    # created_at is the partition key, so a created_at range lets fact_orders scan only those months.
+    # It is a day wider on each side: older rows' created_at came from the database clock and can
+    # fall on a different day than their order_date, and order_date alone decides what's included.
+    if start_date is not None:
+        conditions.append("order_date >= %s AND created_at >= %s::date - 1")
+        params += [start_date, start_date]
+    if end_date is not None:
+        conditions.append("order_date <= %s AND created_at < %s::date + 2")
+        params += [end_date, end_date]
+    columns = list(REVENUE_DIMENSIONS.values()) + ["quantity", "revenue"]
+
+    # A named cursor keeps the result set on the server; only one chunk is in memory at a time
+    try:
+        with conn.cursor(name="order_details_stream") as cur:
+            cur.itersize = chunk_size
+            cur.execute(f"""
+                SELECT COALESCE(product_name, 'unknown') AS product_name,
+                       COALESCE(season, 'unknown') AS season,
+                       COALESCE(location_name, 'unknown') AS location_name,
+                       COALESCE(payment_method, 'unknown') AS payment_method,
+                       quantity, final_amount::float8 AS revenue
+                FROM vw_order_details
+                WHERE {" AND ".join(conditions)}
+            """, params)
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                chunk = pd.DataFrame.from_records(rows, columns=columns)
+                yield chunk.astype({column: "category" for column in REVENUE_DIMENSIONS.values()})
+    finally:
+        conn.rollback()
+
+
+def revenue_breakdown(conn, start_date=None, end_date=None, statuses=DEFAULT_REPORT_STATUSES,
+                      chunk_size=STREAM_CHUNK_SIZE):
+    """Revenue, quantity and line count per product, season, location and payment method
+
+    Each chunk is reduced to per-category totals straight away and folded into
+    the running totals, which are only as large as the number of categories.
+    """
+    import pandas as pd
+    totals = {name: None for name in REVENUE_DIMENSIONS}
+    for chunk in stream_order_details(conn, start_date, end_date, statuses, chunk_size):
+        chunk["lines"] = 1
+        for name, column in REVENUE_DIMENSIONS.items():
+            # dropna=False: a row must count somewhere or the breakdown won't add up to the report totals
+            partial = chunk.groupby(column, observed=True, dropna=False)[["revenue", "quantity", "lines"]].sum()
+            partial.index = partial.index.astype(str)
+            totals[name] = partial if totals[name] is None else totals[name].add(partial, fill_value=0)
+
+    breakdowns = {}
+    for name, column in REVENUE_DIMENSIONS.items():
+        total = totals[name]
+        if total is None:
+            total = pd.DataFrame(columns=["revenue", "quantity", "lines"], dtype="float64")
+        total = total.astype({"quantity": "int64", "lines": "int64"})
+        breakdowns[name] = total.rename_axis(column).sort_values("revenue", ascending=False).reset_index()
+    return breakdowns
+
+
+def refresh_sales_reports(conn, full_refresh=False):
+    """Recompute the report rows touched since the last refresh; returns counts of refreshed keys"""
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT * FROM refresh_sales_reports(%s)", (full_refresh,))
+            counts = dict(cur.fetchone())
+        conn.commit()
+        return counts
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def load_report(conn, report_name):
+    """Read one stored report as a list of dicts"""
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(REPORT_QUERIES[report_name])
+        return [dict(row) for row in cur.fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LMW Farm sales report jobs")
+    parser.add_argument("command", choices=["refresh"])
+    parser.add_argument("--full", action="store_true", help="recompute every report row from scratch")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/lmw_farm"))
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    try:
+        counts = refresh_sales_reports(conn, full_refresh=args.full)
+    except psycopg2.Error as e:
+        print(f"Report refresh failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+    print(", ".join(f"{name}={count}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
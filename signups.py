@@ -0,0 +1,251 @@
+"""Write-behind queue for launch-interest signups (branch2.py)
+
+Kept free of Streamlit like orders.py. A form submit only puts the signup on
+a bounded in-process queue and returns; one background thread per server
+drains it in batches and writes each batch with a single multi-row upsert on
+email, so a launch-day flood costs one round trip per batch instead of a
+connection per signup. The table comes from
+"-- LMW FARM - LAUNCH INTEREST.pgsql"; nothing here creates schema.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+QUEUE_SIZE = 10000  # signups held in memory while the worker catches up
+BATCH_SIZE = 500  # signups per upsert at most
+FLUSH_INTERVAL = 1.0  # seconds the worker waits for a batch to fill
+ENQUEUE_TIMEOUT = 0.05  # seconds a submit waits for room before writing directly
+MAX_RETRY_DELAY = 60  # seconds between attempts at most while the database is down
+MAX_WRITE_ATTEMPTS = 5  # tries at a batch failing for non-connection reasons before it is set aside
+
+# Errors that mean "the database is unreachable", as opposed to a problem with one signup
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InterestSignup:
+    """One launch-interest form submission"""
+    name: str
+    email: str
+    phone: str = None
+    location: str = None
+    interests: str = None
+    contact_preference: str = None
+    notes: str = None
+    submitted_date: datetime = field(default_factory=datetime.now)
+
+    def __post_init__(self):
+        # The upsert key; "Jo@Farm.com " and "jo@farm.com" are the same person
+        object.__setattr__(self, 'email', self.email.strip().lower())
+
+
+def upsert_interest_signups(conn, signups):
+    """Write signups in one statement; a repeat email updates that person's row with the latest answers
+
+    Returns the number of distinct emails written. Commits on success.
+    """
+    # Postgres rejects an upsert that touches the same row twice, so keep each email's latest submission
+    latest = {}
+    for signup in signups:
+        if signup.email not in latest or signup.submitted_date >= latest[signup.email].submitted_date:
+            latest[signup.email] = signup
+    if not latest:
+        return 0
+
+    try:
+        with conn.cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO launch_interest
+                (submitted_date, name, email, phone, location, interests, contact_preference, notes)
+                VALUES %s
+                ON CONFLICT (email) DO UPDATE SET
+                    submitted_date = EXCLUDED.submitted_date,
+                    name = EXCLUDED.name,
+                    phone = EXCLUDED.phone,
+                    location = EXCLUDED.location,
+                    interests = EXCLUDED.interests,
+                    contact_preference = EXCLUDED.contact_preference,
+                    notes = EXCLUDED.notes
+                WHERE launch_interest.submitted_date <= EXCLUDED.submitted_date
+            """, [(s.submitted_date, s.name, s.email, s.phone, s.location, s.interests, s.contact_preference, s.notes)
+                  for s in latest.values()], page_size=BATCH_SIZE)
+        conn.commit()
+        return len(latest)
+    except Exception:
+        conn.rollback()
+        raise
+
+
+class SignupQueue:
+    """Bounded queue of signups flushed to Postgres by a background thread
+
+    connect is a zero-argument callable returning a new psycopg2 connection.
+    If the database is down, signups that can't be written go to the offline
+    journal (journal.Journal, replayed once it is back) when one is given;
+    without one the worker keeps its batch in memory and retries with backoff.
+    Signups still in memory are flushed once more at interpreter exit.
+
+    Signups Postgres rejects, and batches that keep failing for any other
+    reason (say, the launch_interest migration hasn't been run), are logged
+    and set aside: into the journal, where `python journal.py status` lists
+    them once replay gives up, or without a journal into `rejected`.
+    """
+
+    def __init__(self, connect, maxsize=QUEUE_SIZE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 journal=None):
+        self.connect = connect
+        self.journal = journal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.rejected = deque(maxlen=maxsize)  # (signup, error) pairs set aside when there's no journal
+        self._conn = None
+        self._flush_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="signup-writer", daemon=True)
+        self._worker.start()
+        atexit.register(self._flush_at_exit)
+
+    def submit(self, signup):
+        """Queue a signup for the next batch; writes it directly if the queue stays full"""
+        try:
+            self._queue.put(signup, timeout=ENQUEUE_TIMEOUT)
+        except queue.Full:
+            try:
+                with self._flush_lock:
+                    self._write([signup])
+            except CONNECTION_ERRORS:
+                if self.journal is None:
+                    raise
+                self._journal([signup])
+
+    @property
+    def pending(self):
+        """Signups waiting for the worker"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Write everything queued so far from the calling thread"""
+        with self._flush_lock:
+            batch = self._drain([])
+            while batch:
+                self._write(batch)
+                batch = self._drain([])
+
+    def _flush_at_exit(self):
+        """Last chance for queued signups: write them, or journal them once the database proves unreachable"""
+        database_down = False
+        batch = self._drain([])
+        while batch:
+            if not database_down:
+                try:
+                    with self._flush_lock:
+                        self._write(batch)
+                except Exception as e:
+                    logger.error("Couldn't write %d signups at exit: %s", len(batch), e)
+                    database_down = True
+            if database_down:
+                if self.journal is None:
+                    return
+                self._journal(batch)
+            batch = self._drain([])
+
+    def _journal(self, batch):
+        for signup in batch:
+            self.journal.append('signup', asdict(signup))
+
+    def _set_aside(self, batch, error):
+        """Stop retrying signups that won't write, keeping them where a person can find them"""
+        logger.error("Setting aside %d signups: %s", len(batch), error)
+        if self.journal is not None:
+            try:
+                self._journal(batch)
+                return
+            except Exception:
+                logger.exception("Couldn't journal the signups being set aside")
+        self.rejected.extend((signup, str(error)) for signup in batch)
+
+    def _drain(self, batch):
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        if self._conn is None or self._conn.closed:
+            self._conn = self.connect()
+        try:
+            upsert_interest_signups(self._conn, batch)
+        except CONNECTION_ERRORS:
+            self._conn.close()
+            self._conn = None
+            raise
+
+    def _write_each(self, batch):
+        """Write a batch one signup at a time, setting aside any Postgres rejects; returns the ones still unwritten"""
+        for index, signup in enumerate(batch):
+            try:
+                with self._flush_lock:
+                    self._write([signup])
+            except psycopg2.DataError as e:
+                self._set_aside([signup], e)
+                continue
+            except Exception:
+                return batch[index:]
+        return []
+
+    def _run(self):
+        retry_delay = 1
+        failures = 0  # consecutive non-connection failures of the current batch
+        batch = []
+        while True:
+            if not batch:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    continue
+                # Give a burst a moment to fill the batch before paying for a round trip
+                time.sleep(min(self.flush_interval, 0.1))
+            batch = self._drain(batch)
+            try:
+                with self._flush_lock:
+                    self._write(batch)
+                batch = []
+                retry_delay = 1
+                failures = 0
+                continue
+            except CONNECTION_ERRORS as e:
+                logger.warning("Database unreachable writing %d signups: %s", len(batch), e)
+                if self.journal is not None:
+                    try:
+                        self._journal(batch)
+                        batch = []
+                    except Exception:
+                        # Keep the batch in memory and retry the database
+                        logger.exception("Couldn't journal %d signups; will retry the database", len(batch))
+            except psycopg2.DataError:
+                # One bad submission (say, an over-long name) must not hold up the rest of the batch
+                batch = self._write_each(batch)
+                if not batch:
+                    continue
+            except Exception as e:
+                failures += 1
+                logger.error("Writing %d signups failed (attempt %d of %d): %s",
+                             len(batch), failures, MAX_WRITE_ATTEMPTS, e)
+                if failures >= MAX_WRITE_ATTEMPTS:
+                    self._set_aside(batch, e)
+                    batch = []
+                    failures = 0
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
@@ -0,0 +1,302 @@
+"""Warehouse loader for the LMW Farm star schema
+
+Moves confirmed storefront orders (orders / order_items) into fact_orders.
+Surrogate keys are resolved from lookup maps built once per batch and line
+items are bulk loaded with COPY into a staging table, then merged with
+ON CONFLICT (order_number, product_id, created_at) DO NOTHING so reruns
+never double-count.
+
+    DATABASE_URL=postgresql://localhost/lmw_farm python warehouse.py load-orders
+    DATABASE_URL=postgresql://localhost/lmw_farm python warehouse.py extend-calendar
+    DATABASE_URL=postgresql://localhost/lmw_farm python warehouse.py create-partitions
+    DATABASE_URL=postgresql://localhost/lmw_farm python warehouse.py archive-partitions --before 2026-01-01
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+
+DEFAULT_BATCH_SIZE = 1000
+DIM_TIME_HORIZON_DAYS = 730  # keep two years of dim_time ahead of today
+PARTITION_MONTHS_AHEAD = 3
+PARTITIONED_TABLES = ('fact_orders', 'inventory_transactions')
+PAYMENT_STATUS = 'pending'  # storefront orders are paid at pickup
+
+FACT_COLUMNS = (
+    'product_id', 'customer_id', 'time_id', 'location_id', 'payment_id', 'order_number',
+    'quantity', 'unit_price', 'line_total', 'order_status', 'created_at'
+)
+
+
+class TimeIdCache:
+    """date -> dim_time.time_id lookups without a database round trip
+
+    time_ids are stored in a flat int array indexed by days since the first
+    calendar date (0 marks a missing date), so a lookup is one subtraction.
+    """
+
+    def __init__(self, rows):
+        rows = sorted(rows)
+        self.first_date = rows[0][0] if rows else None
+        self.last_date = rows[-1][0] if rows else None
+        span = (self.last_date - self.first_date).days + 1 if rows else 0
+        self._time_ids = array('i', bytes(span * array('i').itemsize))
+        for day, time_id in rows:
+            self._time_ids[(day - self.first_date).days] = time_id
+
+    def get(self, day):
+        """time_id for a date, or None if dim_time doesn't have it"""
+        if self.first_date is None or not self.first_date <= day <= self.last_date:
+            return None
+        return self._time_ids[(day - self.first_date).days] or None
+
+
+def ensure_dim_time(conn, horizon_days=DIM_TIME_HORIZON_DAYS):
+    """Add any dim_time dates missing through today + horizon_days; returns the number added"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT extend_dim_time(%s)", (horizon_days,))
+            added = cur.fetchone()[0]
+        conn.commit()
+        return added
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def load_time_id_cache(conn):
+    """Read the whole calendar into a TimeIdCache (a few KB per decade)"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT date, time_id FROM dim_time")
+        return TimeIdCache(cur.fetchall())
+
+
+def ensure_partitions(conn, months_ahead=PARTITION_MONTHS_AHEAD):
+    """Create the monthly partitions of fact_orders and inventory_transactions through months_ahead"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT ensure_monthly_partitions(%s)", (months_ahead,))
+            created = cur.fetchone()[0]
+        conn.commit()
+        return created
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def archive_partitions(conn, cutoff, archive_schema='archive'):
+    """Detach the monthly partitions that end on or before cutoff into archive_schema"""
+    archived = []
+    try:
+        with conn.cursor() as cur:
+            for table in PARTITIONED_TABLES:
+                cur.execute("SELECT archive_monthly_partitions(%s, %s, %s)", (table, cutoff, archive_schema))
+                archived.extend(row[0] for row in cur.fetchall())
+        conn.commit()
+        return archived
+    except Exception:
+        conn.rollback()
+        raise
+
+
+@dataclass
+class LoadStats:
+    """Running totals for one loader run"""
+    orders_seen: int = 0
+    lines_loaded: int = 0
+    skipped_orders: dict = field(default_factory=dict)  # order_number -> reason
+
+
+def fetch_order_batch(cur, after_order_id, batch_size):
+    """Fetch the line items of the next confirmed orders that aren't in fact_orders yet"""
+    cur.execute("""
+        SELECT o.id AS order_id, o.order_number, o.customer_name, o.customer_email,
+               o.customer_phone, o.pickup_method, o.payment_method, o.created_at,
+               p.sku, oi.quantity, oi.unit_price, oi.line_total
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        JOIN products p ON p.id = oi.product_id
+        WHERE o.id IN (
+            SELECT pending.id FROM orders pending
+            WHERE pending.order_status = 'confirmed' AND pending.id > %s
+              AND NOT EXISTS (SELECT 1 FROM fact_orders fo WHERE fo.order_number = pending.order_number)
+            ORDER BY pending.id
+            LIMIT %s
+        )
+        ORDER BY o.id, p.sku
+    """, (after_order_id, batch_size))
+    return cur.fetchall()
+
+
+def split_name(full_name):
+    first, _, last = (full_name or '').strip().partition(' ')
+    return first or None, last.strip() or None
+
+
+def build_lookup_maps(conn, lines, time_ids):
+    """Resolve every surrogate key the batch needs with one query per dimension"""
+    cur = conn.cursor()
+    emails = {line['customer_email'].strip().lower() for line in lines}
+    customers = {}
+    for line in lines:
+        customers.setdefault(line['customer_email'].strip().lower(), line)
+    execute_values(cur, """
+        INSERT INTO dim_customers (email, first_name, last_name, phone, registration_date)
+        VALUES %s
+        ON CONFLICT (email) DO NOTHING
+    """, [(email, *split_name(line['customer_name']), line['customer_phone'], line['created_at'].date())
+          for email, line in customers.items()])
+
+    payment_methods = {line['payment_method'] or 'unknown' for line in lines}
+    execute_values(cur, """
+        INSERT INTO dim_payment (payment_method, payment_status)
+        VALUES %s
+        ON CONFLICT (payment_method, payment_status) WHERE transaction_id IS NULL DO NOTHING
+    """, [(method, PAYMENT_STATUS) for method in payment_methods])
+
+    maps = {'time': time_ids}
+    cur.execute("SELECT sku, product_id FROM dim_products WHERE sku = ANY(%s)",
+                (list({line['sku'] for line in lines}),))
+    maps['product'] = dict(cur.fetchall())
+    cur.execute("SELECT email, customer_id FROM dim_customers WHERE email = ANY(%s)", (list(emails),))
+    maps['customer'] = dict(cur.fetchall())
+    cur.execute("SELECT pickup_code, location_id FROM dim_locations WHERE pickup_code = ANY(%s)",
+                (list({line['pickup_method'] for line in lines}),))
+    maps['location'] = dict(cur.fetchall())
+    cur.execute("""
+        SELECT payment_method, payment_id FROM dim_payment
+        WHERE payment_status = %s AND transaction_id IS NULL AND payment_method = ANY(%s)
+    """, (PAYMENT_STATUS, list(payment_methods)))
+    maps['payment'] = dict(cur.fetchall())
+    cur.close()
+    return maps
+
+
+def resolve_fact_rows(lines, maps, stats):
+    """Turn storefront line items into fact rows; orders with any unresolvable key are skipped whole"""
+    orders = {}
+    for line in lines:
+        orders.setdefault(line['order_number'], []).append(line)
+
+    fact_rows = []
+    for order_number, order_lines in orders.items():
+        first = order_lines[0]
+        keys = {
+            'customer': maps['customer'].get(first['customer_email'].strip().lower()),
+            'time': maps['time'].get(first['created_at'].date()),
+            'location': maps['location'].get(first['pickup_method']),
+            'payment': maps['payment'].get(first['payment_method'] or 'unknown'),
+        }
+        missing = [name for name, key in keys.items() if key is None]
+        missing += [f"product {line['sku']}" for line in order_lines if line['sku'] not in maps['product']]
+        if missing:
+            stats.skipped_orders[order_number] = "no dimension row for " + ", ".join(missing)
+            continue
+        for line in order_lines:
+            fact_rows.append((
+                maps['product'][line['sku']], keys['customer'], keys['time'], keys['location'], keys['payment'],
+                order_number, line['quantity'], line['unit_price'], line['line_total'], 'confirmed',
+                line['created_at']
+            ))
+    return fact_rows
+
+
+def copy_fact_rows(cur, fact_rows):
+    """COPY fact rows into a staging table and merge them; returns the number of new rows"""
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS fact_orders_stage
+        (LIKE fact_orders INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+    """)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in fact_rows:
+        writer.writerow(['' if value is None else value for value in row])
+    buffer.seek(0)
+    columns = ', '.join(FACT_COLUMNS)
+    cur.copy_expert(f"COPY fact_orders_stage ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cur.execute(f"""
+        INSERT INTO fact_orders ({columns})
+        SELECT {columns} FROM fact_orders_stage
+        ON CONFLICT (order_number, product_id, created_at) DO NOTHING
+    """)
+    return cur.rowcount
+
+
+def load_confirmed_orders(conn, batch_size=DEFAULT_BATCH_SIZE):
+    """Load all confirmed storefront orders not yet in fact_orders, one transaction per batch"""
+    ensure_dim_time(conn)
+    time_ids = load_time_id_cache(conn)
+    stats = LoadStats()
+    after_order_id = 0
+    while True:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                lines = fetch_order_batch(cur, after_order_id, batch_size)
+                if not lines:
+                    conn.rollback()
+                    return stats
+                maps = build_lookup_maps(conn, lines, time_ids)
+                fact_rows = resolve_fact_rows(lines, maps, stats)
+                if fact_rows:
+                    stats.lines_loaded += copy_fact_rows(cur, fact_rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        stats.orders_seen += len({line['order_id'] for line in lines})
+        after_order_id = max(line['order_id'] for line in lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LMW Farm warehouse jobs")
+    parser.add_argument("command", choices=["load-orders", "extend-calendar", "create-partitions", "archive-partitions"])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="orders per transaction")
+    parser.add_argument("--horizon-days", type=int, default=DIM_TIME_HORIZON_DAYS,
+                        help="days past today that dim_time must cover")
+    parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD,
+                        help="months past this one to create partitions for")
+    parser.add_argument("--before", type=date.fromisoformat,
+                        help="archive partitions that end on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--archive-schema", default="archive")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/lmw_farm"))
+    args = parser.parse_args()
+    if args.command == "archive-partitions" and args.before is None:
+        parser.error("archive-partitions needs --before")
+
+    conn = psycopg2.connect(args.dsn)
+    try:
+        if args.command == "extend-calendar":
+            added = ensure_dim_time(conn, args.horizon_days)
+            print(f"dim_time dates added={added}")
+            return
+        if args.command == "create-partitions":
+            created = ensure_partitions(conn, args.months_ahead)
+            print(f"partitions created={created}")
+            return
+        if args.command == "archive-partitions":
+            archived = archive_partitions(conn, args.before, args.archive_schema)
+            print(f"partitions archived={len(archived)}")
+            for name in archived:
+                print(f"  {args.archive_schema}.{name}")
+            return
+        stats = load_confirmed_orders(conn, args.batch_size)
+    except psycopg2.Error as e:
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print(f"orders={stats.orders_seen} lines_loaded={stats.lines_loaded} skipped={len(stats.skipped_orders)}")
+    for order_number, reason in stats.skipped_orders.items():
+        print(f"  skipped {order_number}: {reason}")
+
+
+if __name__ == "__main__":
+    main()